@@ -18,7 +18,8 @@ config = context.config
 config.set_main_option('sqlalchemy.url', settings.ALEMBIC_DATABASE_URL)
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# init_db runs migrations in process and keeps the app's logging setup
+if config.config_file_name is not None and config.attributes.get('configure_logger', True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -0,0 +1,41 @@
+"""ohlcv prices as double precision
+
+Revision ID: 3f1c9a7d2b40
+Revises: a90c3e5b7d12
+Create Date: 2026-10-15 09:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c9a7d2b40'
+down_revision: Union[str, Sequence[str], None] = 'a90c3e5b7d12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'adj_close')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in PRICE_COLUMNS:
+        op.alter_column(
+            'ohlcv_daily', column,
+            type_=sa.Float(),
+            postgresql_using=f'{column}::double precision'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in PRICE_COLUMNS:
+        op.alter_column(
+            'ohlcv_daily', column,
+            type_=sa.Numeric(12, 4),
+            postgresql_using=f'{column}::numeric(12, 4)'
+        )
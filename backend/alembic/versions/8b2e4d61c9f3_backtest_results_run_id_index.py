@@ -0,0 +1,28 @@
+"""index backtest_results.run_id
+
+Revision ID: 8b2e4d61c9f3
+Revises: 3f1c9a7d2b40
+Create Date: 2026-10-15 11:03:27.562810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d61c9f3'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_backtest_results_run_id', 'backtest_results', ['run_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_backtest_results_run_id', table_name='backtest_results')
@@ -0,0 +1,174 @@
+"""baseline schema
+
+Revision ID: a90c3e5b7d12
+Revises: 
+Create Date: 2026-10-16 10:02:51.774310
+
+the tables as they stood before migrations were introduced, hypertable and compression
+setup stays in init_db.TIMESCALE_SQL
+
+a database created earlier by create_all already has these tables, don't run this
+revision against it. stamp it instead: `alembic stamp a90c3e5b7d12` if ohlcv prices are
+still numeric, `alembic stamp 3f1c9a7d2b40` if they're already double precision, then
+`alembic upgrade head`
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a90c3e5b7d12'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stocks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ticker', sa.String(length=10), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('exchange', sa.String(length=50), nullable=True),
+    sa.Column('sector', sa.String(length=100), nullable=True),
+    sa.Column('industry', sa.String(length=100), nullable=True),
+    sa.Column('market_cap', sa.BigInteger(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_stocks_exchange'), 'stocks', ['exchange'], unique=False)
+    op.create_index(op.f('ix_stocks_id'), 'stocks', ['id'], unique=False)
+    op.create_index(op.f('ix_stocks_sector'), 'stocks', ['sector'], unique=False)
+    op.create_index(op.f('ix_stocks_ticker'), 'stocks', ['ticker'], unique=True)
+    op.create_table('users',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('custom_formulas',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('formula_code', sa.Text(), nullable=False),
+    sa.Column('compiled_ast', sa.Text(), nullable=True),
+    sa.Column('is_public', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('ohlcv_daily',
+    sa.Column('time', sa.DateTime(), nullable=False),
+    sa.Column('stock_id', sa.Integer(), nullable=False),
+    sa.Column('open', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('high', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('low', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('close', sa.Numeric(precision=12, scale=4), nullable=False),
+    sa.Column('adj_close', sa.Numeric(precision=12, scale=4), nullable=True),
+    sa.Column('volume', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['stock_id'], ['stocks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('time', 'stock_id')
+    )
+    op.create_index('idx_ohlcv_stock_time', 'ohlcv_daily', ['stock_id', 'time'], unique=False)
+    op.create_table('strategies',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_public', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('watchlists',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('backtest_runs',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('strategy_id', sa.String(length=36), nullable=False),
+    sa.Column('stock_id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('initial_capital', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['stock_id'], ['stocks.id'], ),
+    sa.ForeignKeyConstraint(['strategy_id'], ['strategies.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('strategy_rules',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('strategy_id', sa.String(length=36), nullable=False),
+    sa.Column('rule_type', sa.String(length=20), nullable=False),
+    sa.Column('condition_json', sa.Text(), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['strategy_id'], ['strategies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('watchlist_items',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('watchlist_id', sa.String(length=36), nullable=False),
+    sa.Column('stock_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['stock_id'], ['stocks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['watchlist_id'], ['watchlists.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('backtest_results',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('run_id', sa.String(length=36), nullable=False),
+    sa.Column('total_return', sa.Numeric(precision=10, scale=4), nullable=True),
+    sa.Column('sharpe_ratio', sa.Numeric(precision=8, scale=4), nullable=True),
+    sa.Column('max_drawdown', sa.Numeric(precision=10, scale=4), nullable=True),
+    sa.Column('win_rate', sa.Numeric(precision=6, scale=4), nullable=True),
+    sa.Column('total_trades', sa.Integer(), nullable=True),
+    sa.Column('equity_curve', sa.Text(), nullable=True),
+    sa.Column('trades', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['run_id'], ['backtest_runs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('backtest_results')
+    op.drop_table('watchlist_items')
+    op.drop_table('strategy_rules')
+    op.drop_table('backtest_runs')
+    op.drop_table('watchlists')
+    op.drop_table('strategies')
+    op.drop_index('idx_ohlcv_stock_time', table_name='ohlcv_daily')
+    op.drop_table('ohlcv_daily')
+    op.drop_table('custom_formulas')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_stocks_ticker'), table_name='stocks')
+    op.drop_index(op.f('ix_stocks_sector'), table_name='stocks')
+    op.drop_index(op.f('ix_stocks_id'), table_name='stocks')
+    op.drop_index(op.f('ix_stocks_exchange'), table_name='stocks')
+    op.drop_table('stocks')
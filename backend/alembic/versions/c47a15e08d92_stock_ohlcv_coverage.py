@@ -0,0 +1,32 @@
+"""stock ohlcv coverage columns
+
+Revision ID: c47a15e08d92
+Revises: 8b2e4d61c9f3
+Create Date: 2026-10-15 14:21:08.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47a15e08d92'
+down_revision: Union[str, Sequence[str], None] = '8b2e4d61c9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('stocks', sa.Column('data_start', sa.Date(), nullable=True))
+    op.add_column('stocks', sa.Column('data_end', sa.Date(), nullable=True))
+    op.add_column('stocks', sa.Column('refreshed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('stocks', 'refreshed_at')
+    op.drop_column('stocks', 'data_end')
+    op.drop_column('stocks', 'data_start')
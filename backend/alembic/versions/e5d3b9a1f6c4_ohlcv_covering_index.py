@@ -0,0 +1,36 @@
+"""ohlcv covering index
+
+Revision ID: e5d3b9a1f6c4
+Revises: c47a15e08d92
+Create Date: 2026-10-15 16:02:44.517209
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5d3b9a1f6c4'
+down_revision: Union[str, Sequence[str], None] = 'c47a15e08d92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # older boots created a separate covering index next to idx_ohlcv_stock_time, fold the
+    # two into one so inserts only maintain a single (stock_id, time) btree
+    op.execute('DROP INDEX IF EXISTS idx_ohlcv_covering')
+    op.drop_index('idx_ohlcv_stock_time', table_name='ohlcv_daily')
+    op.create_index(
+        'idx_ohlcv_stock_time', 'ohlcv_daily', ['stock_id', 'time'],
+        postgresql_include=['open', 'high', 'low', 'close', 'volume']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_ohlcv_stock_time', table_name='ohlcv_daily')
+    op.create_index('idx_ohlcv_stock_time', 'ohlcv_daily', ['stock_id', 'time'])
@@ -0,0 +1,31 @@
+"""drop indicator_daily
+
+Revision ID: f2a8c6d4e913
+Revises: e5d3b9a1f6c4
+Create Date: 2026-10-15 16:40:12.281935
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8c6d4e913'
+down_revision: Union[str, Sequence[str], None] = 'e5d3b9a1f6c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # indicator_daily was only ever created by the boot ddl of an abandoned indicator store,
+    # nothing reads it anymore. a hypertable drops with its chunks like a plain table
+    op.execute('DROP TABLE IF EXISTS indicator_daily')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # the store it backed is gone, there's nothing to recreate it for
+    pass
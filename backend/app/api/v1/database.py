@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base import get_session
@@ -30,7 +31,10 @@ async def get_table_rows(
 ):
     try:
         service = DatabaseExplorerService(session)
-        return await service.get_table_rows(table_name=table_name, limit=limit, offset=offset)
+        body = await service.get_table_rows_json(table_name=table_name, limit=limit, offset=offset)
+        if isinstance(body, bytes):
+            return Response(content=body, media_type="application/json")
+        return StreamingResponse(body, media_type="application/json")
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
     except ValueError as exc:
@@ -1,82 +1,142 @@
-from fastapi import APIRouter, Query, HTTPException, Depends
+from fastapi import APIRouter, Query, HTTPException, Depends, Response
 from typing import List
+import asyncio
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import get_session
+from app.db.base import get_session, async_session_maker
+from app.cache import cache_get, cache_set, cache_key, params_key, seconds_until_market_close
 from app.schemas.indicator import *
 from app.services.indicators.calculator import indicator_calculator
-from app.services.indicators.registry import indicator_registry
+from app.services.indicators.registry import indicator_registry, indicator_detail
+from app.services.indicators.memo import memo_key, memo_get, memo_set
 from app.services.stock_service import StockDataService
 
 router = APIRouter(prefix="/indicators", tags=["indicators"])
 
-@router.get("/")
-def get_available_indicators():
-    indicators = indicator_registry.list_all()
-    result = [IndicatorSummary(
+# tickers computed at once by /calculate-multi/, each holds a pooled connection
+# and may hit yfinance on a cold symbol
+MULTI_TICKER_CONCURRENCY = 8
+
+# the registry is fixed once imported, so the metadata payloads are serialized once
+_INDEX_JSON = orjson.dumps([
+    IndicatorSummary(
         name=ind.name,
         display_name=ind.display_name,
         category=ind.category
-    ) for ind in indicators]
+    ).model_dump(mode="json")
+    for ind in indicator_registry.list_all()
+])
+
+_DETAIL_JSON = {
+    ind.name: orjson.dumps(indicator_detail(ind.name).model_dump(mode="json"))
+    for ind in indicator_registry.list_all()
+}
+
 
-    return result
+@router.get("/", response_model=List[IndicatorSummary])
+def get_available_indicators():
+    return Response(content=_INDEX_JSON, media_type="application/json")
 
 
-@router.get("/{indicator_name}/")
+@router.get("/{indicator_name}/", response_model=IndicatorDetail)
 def get_indicator_info(indicator_name: str):
-    ind = indicator_registry.get(indicator_name)
+    detail = _DETAIL_JSON.get(indicator_name)
 
-    if not ind:
+    if detail is None:
         raise HTTPException(status_code=404, detail=f"Indicator {indicator_name} does not exist in current registry")
 
-    return IndicatorDetail(
-        name=ind.name,
-        display_name=ind.display_name,
-        category=ind.category,
-        output_type=ind.output_type,
-        params=[IndicatorParamSchema(
-            name=p.name,
-            param_type= p.param_type,
-            default=p.default,
-            min_val=p.min_val,
-            max_val=p.max_val
-        ) for p in ind.params],
-        output_names= ind.output_names
-    )
-
-
-@router.post("/calculate/")
-async def calculate_indicator(request: CalculateRequest, session: AsyncSession = Depends(get_session)):
+    return Response(content=detail, media_type="application/json")
+
+
+async def _indicator_body(session: AsyncSession, ticker: str, period: str, indicator_name: str, params: dict) -> bytes:
+    """CalculateResponse json for one ticker, through the redis cache and the in-process memo"""
+
+    key = cache_key("indicator", ticker.upper(), period, indicator_name, params_key(params))
+
+    cached = await cache_get(key)
+    if cached is not None:
+        return cached
+
     stock_service = StockDataService(session)
 
-    ohlcv_response = await stock_service.get_ohlcv(request.ticker, request.period)
+    stock, start_date, end_date = await stock_service.prepare_ohlcv(ticker, period)
+
+    # same inputs over the same bars, skip the ohlcv read and the math entirely. refreshed_at
+    # moves on every store, so a forced refresh or a re-fetched partial bar misses too
+    latest_bar = await stock_service.latest_bar_time(stock.id)
+    memo = memo_key(ticker, period, indicator_name, params, start_date, latest_bar, stock.refreshed_at)
+
+    calc = memo_get(memo)
+    if calc is None:
+        arrays = await stock_service.get_range_arrays(stock.id, start_date, end_date)
+
+        calc = await indicator_calculator.calculate_async(arrays, indicator_name, params)
 
-    calc = indicator_calculator.calculate(ohlcv_response, request.indicator_name, request.params)
+        memo_set(memo, calc)
 
-    return CalculateResponse(
-        indicator=calc.get('indicator'),
-        output_type=calc.get('output_type'),
-        data=calc.get('data')
-    )
+    # calc is already plain json-ready data, hand it straight to orjson
+    body = orjson.dumps(calc)
+    await cache_set(key, body, seconds_until_market_close())
 
-@router.post("/calculate-batch/")
+    return body
+
+
+@router.post("/calculate/", response_model=CalculateResponse)
+async def calculate_indicator(request: CalculateRequest, session: AsyncSession = Depends(get_session)):
+    try:
+        body = await _indicator_body(session, request.ticker, request.period, request.indicator_name, request.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return Response(content=body, media_type="application/json")
+
+
+@router.post("/calculate-multi/", response_model=MultiCalculateResponse)
+async def calculate_multi(request: MultiCalculateRequest):
+    """one indicator across several tickers, computed concurrently"""
+
+    try:
+        indicator, _ = indicator_calculator.resolve(request.indicator_name, request.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # repeated tickers collapse into one computation
+    tickers = list(dict.fromkeys(t.upper() for t in request.tickers))
+    semaphore = asyncio.Semaphore(MULTI_TICKER_CONCURRENCY)
+
+    # fetch yfinance info for any brand new symbols, then any missing bars, in batches up front
+    async with async_session_maker() as session:
+        service = StockDataService(session)
+        await service.prefetch_missing_stocks(tickers)
+        await service.prefetch_ohlcv(tickers, request.period)
+
+    async def one(ticker: str) -> bytes:
+        # an AsyncSession can't run queries concurrently, every ticker gets its own
+        async with semaphore, async_session_maker() as session:
+            return await _indicator_body(session, ticker, request.period, request.indicator_name, request.params)
+
+    bodies = await asyncio.gather(*[one(t) for t in tickers])
+
+    # the per ticker bodies are already json, splice them in rather than re-encoding
+    results = b",".join(orjson.dumps(t) + b":" + body for t, body in zip(tickers, bodies))
+    content = b'{"indicator":' + orjson.dumps(indicator.name) + b',"results":{' + results + b"}}"
+
+    return Response(content=content, media_type="application/json")
+
+@router.post("/calculate-batch/", response_model=BatchCalculateResponse)
 async def calculate_batch(request: BatchCalculateRequest, session: AsyncSession = Depends(get_session)):
     stock_service = StockDataService(session)
 
-    ohlcv_response = await stock_service.get_ohlcv(request.ticker, request.period)
-
-    res = []
-    for item in request.indicators:
-        calc = indicator_calculator.calculate(ohlcv_response, item.name, item.params)
-        calc_res = CalculateResponse(
-            indicator=calc.get('indicator'),
-            output_type=calc.get('output_type'),
-            data=calc.get('data')
-        )
-        res.append(calc_res)
-
-    return BatchCalculateResponse(
-        ticker=request.ticker,
-        results=res
-    )
+    arrays = await stock_service.get_ohlcv_arrays(request.ticker, request.period)
+
+    try:
+        calcs = await indicator_calculator.calculate_many_async(arrays, request.indicators)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return Response(content=orjson.dumps({
+        "ticker": request.ticker,
+        "results": calcs
+    }), media_type="application/json")
     
\ No newline at end of file
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Optional, Union
+import orjson
 
 from app.db.base import get_session
+from app.cache import cache_get, cache_set, cache_delete_prefix, cache_key, seconds_until_market_close
 from app.services.stock_service import StockDataService
-from app.schemas.stock import OHLCVResponse, StockInfo
+from app.schemas.stock import OHLCVResponse, OHLCVColumnsResponse, StockInfo
 from app.utils.search import StockSearchService
 
 
@@ -12,20 +15,61 @@ router = APIRouter(prefix="/stocks", tags=["stocks"])
 
 search_service = StockSearchService()
 
-@router.get("/{ticker}/ohlcv", response_model=OHLCVResponse)
+# long horizons are streamed through a db cursor instead of built in memory
+STREAM_PERIODS = {"5y", "10y", "max"}
+
+
+async def _stream_and_cache(chunks, key: str):
+    """pass the stream through, caching the assembled body once it completes"""
+    body = []
+    async for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+
+    await cache_set(key, b"".join(body), seconds_until_market_close())
+
+@router.get("/{ticker}/ohlcv", response_model=Union[OHLCVResponse, OHLCVColumnsResponse])
 async def get_ohlcv(
     ticker: str,
     period: str = Query("max", regex="^(1d|5d|1mo|3mo|6mo|1y|2y|5y|10y|ytd|max)$"),
     force_refresh: bool = False, 
+    layout: str = Query("rows", alias="format", pattern="^(rows|columns)$", description="rows: list of bars, columns: one array per field"),
     session: AsyncSession = Depends(get_session)
 ):
     """Get OHLCV data for a stock"""
 
+    key = cache_key("ohlcv", ticker.upper(), period, layout)
+
+    if force_refresh:
+        # indicator results were computed from the bars we're about to replace
+        await cache_delete_prefix(cache_key("ohlcv", ticker.upper(), ""))
+        await cache_delete_prefix(cache_key("indicator", ticker.upper(), ""))
+    else:
+        cached = await cache_get(key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
     try: 
         service = StockDataService(session)
-        return await service.get_ohlcv(ticker, period, force_refresh)
+
+        if layout == "columns":
+            # columnar is compact enough to build whole, even for the long horizons
+            body = await service.get_ohlcv_columns_json(ticker, period, force_refresh)
+
+        elif period in STREAM_PERIODS:
+            stock, start_date, end_date = await service.prepare_ohlcv(ticker, period, force_refresh)
+            chunks = StockDataService.stream_ohlcv_json(stock.id, ticker, period, start_date, end_date)
+            return StreamingResponse(_stream_and_cache(chunks, key), media_type="application/json")
+
+        else:
+            ohlcv = await service.get_ohlcv(ticker, period, force_refresh)
+            # skip fastapi's revalidation + jsonable_encoder pass over every point
+            body = orjson.dumps(ohlcv.model_dump())
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching data: {str(e)}")
+
+    await cache_set(key, body, seconds_until_market_close())
+    return Response(content=body, media_type="application/json")
     
 
 @router.get("/{ticker}/info", response_model=StockInfo)
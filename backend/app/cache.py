@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+import logging
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_CLOSE_HOUR = 16
+# give yfinance a little while after the bell before we trust the daily bar
+CLOSE_SETTLE_MINUTES = 30
+
+_redis: Optional[Redis] = None
+
+
+async def init_cache():
+    """connect to redis, cache stays disabled if it's not configured or reachable"""
+    global _redis
+
+    if not settings.REDIS_URL:
+        logger.info("REDIS_URL not set, response cache disabled")
+        return
+
+    client = Redis.from_url(settings.REDIS_URL)
+    try:
+        await client.ping()
+    except (RedisError, OSError) as e:
+        logger.warning(f"Redis unavailable, response cache disabled: {e}")
+        await client.aclose()
+        return
+
+    _redis = client
+    logger.info("Response cache connected")
+
+
+async def close_cache():
+    global _redis
+
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def cache_key(*parts) -> str:
+    return ":".join(str(p) for p in parts)
+
+
+def params_key(params: dict) -> str:
+    """stable key fragment for an indicator params dict"""
+    return orjson.dumps(params, option=orjson.OPT_SORT_KEYS).decode()
+
+
+def seconds_until_market_close(now: Optional[datetime] = None) -> int:
+    """ttl that expires shortly after the next market close, when the daily bar changes"""
+
+    now = now or datetime.now(MARKET_TZ)
+    expiry = now.replace(hour=MARKET_CLOSE_HOUR, minute=CLOSE_SETTLE_MINUTES, second=0, microsecond=0)
+
+    if expiry <= now:
+        expiry += timedelta(days=1)
+
+    return max(int((expiry - now).total_seconds()), 1)
+
+
+async def cache_get(key: str) -> Optional[bytes]:
+    if _redis is None:
+        return None
+
+    try:
+        return await _redis.get(key)
+    except RedisError as e:
+        logger.warning(f"Cache get failed for {key}: {e}")
+        return None
+
+
+async def cache_set(key: str, value: bytes, ttl: int):
+    if _redis is None:
+        return
+
+    try:
+        await _redis.set(key, value, ex=ttl)
+    except RedisError as e:
+        logger.warning(f"Cache set failed for {key}: {e}")
+
+
+async def cache_delete_prefix(prefix: str):
+    if _redis is None:
+        return
+
+    try:
+        keys = [k async for k in _redis.scan_iter(match=f"{prefix}*")]
+        if keys:
+            await _redis.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache invalidation failed for {prefix}: {e}")
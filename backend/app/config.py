@@ -8,12 +8,21 @@ class Settings(BaseSettings):
     DB_USER: str = "trading_user"
     DB_PASSWORD: str = "trading_pass_dev"
     DB_NAME: str = "trading_db"
+    DB_POOL_SIZE: int = 20
+    DB_POOL_OVERFLOW: int = 40
+    # schema ddl on app boot, leave off when migrations run as a separate job
+    RUN_DB_MIGRATIONS: bool = False
+    # bulk load fetched bars with COPY + merge, off falls back to batched INSERT .. ON CONFLICT
+    OHLCV_COPY_INGEST: bool = True
 
     APP_NAME: str = "Trading Platform"
-    DEBUG: bool = True
+    DEBUG: bool = False
+    SQL_ECHO: bool = False
 
     AWS_REGION: Optional[str] = None
 
+    REDIS_URL: Optional[str] = "redis://localhost:6379/0"
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -3,15 +3,38 @@ from sqlalchemy.orm import DeclarativeBase
 from datetime import datetime
 from sqlalchemy import Column, DateTime
 from app.config import settings
+import logging
+import orjson
+
+# init_db's basicConfig would otherwise let per-statement engine logs through
+if not settings.SQL_ECHO:
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+
+def _json_serializer(value) -> str:
+    return orjson.dumps(value).decode()
 
 
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
+    echo=settings.SQL_ECHO,
     future=True,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_POOL_OVERFLOW,
+    pool_use_lifo=True,     # reuse the hottest connections so idle extras can age out
+    pool_recycle=1800,
+    pool_timeout=30,
+    connect_args={
+        # asyncpg's own cache (raw driver queries) and sqlalchemy's adapter cache (orm/core)
+        "statement_cache_size": 2048,
+        "prepared_statement_cache_size": 2048,
+        "max_cached_statement_lifetime": 0,     # pool_recycle already bounds connection age
+        "server_settings": {"jit": "off", "application_name": "tradenow"},
+    },
+    # asyncpg's json codec is installed by the dialect, these swap its stdlib json for orjson
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
 )
 
 async_session_maker = async_sessionmaker(
@@ -29,8 +52,6 @@ class TimestampMixin:
 
 
 async def get_session() -> AsyncSession:
+    # the context manager closes the session on exit
     async with async_session_maker() as session:
-        try: 
-            yield session
-        finally:
-            await session.close()
\ No newline at end of file
+        yield session
\ No newline at end of file
@@ -1,45 +1,88 @@
-from sqlalchemy import text
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, text
 from app.db.base import engine, Base
+from app.config import settings
 from app.models import *
+import asyncio
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
 
 async def init_db():
-    """init db with tables and timescale hypertable"""
+    """app startup hook, only touches the schema when RUN_DB_MIGRATIONS is set"""
+
+    if not settings.RUN_DB_MIGRATIONS:
+        logger.info("RUN_DB_MIGRATIONS is off, skipping schema setup")
+        return
+
+    await create_schema()
+
+
+# every statement is idempotent, so the whole block goes over in a single round trip
+TIMESCALE_SQL = """
+    CREATE EXTENSION IF NOT EXISTS timescaledb CASCADE;
+
+    SELECT create_hypertable(
+        'ohlcv_daily',
+        'time',
+        if_not_exists => True,
+        chunk_time_interval => INTERVAL '1 month'
+        );
+
+    CREATE INDEX IF NOT EXISTS idx_ohlcv_stock_time_desc
+    ON ohlcv_daily (stock_id, time DESC);
+
+    -- compression settings can't be changed once chunks are compressed, so only set them once
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM timescaledb_information.hypertables
+            WHERE hypertable_name = 'ohlcv_daily' AND compression_enabled
+        ) THEN
+            ALTER TABLE ohlcv_daily SET (
+                timescaledb.compress,
+                timescaledb.compress_segmentby = 'stock_id',
+                timescaledb.compress_orderby = 'time'
+            );
+        END IF;
+    END $$;
+
+    SELECT add_compression_policy('ohlcv_daily', INTERVAL '90 days', if_not_exists => True);
+"""
+
+
+def _upgrade_head():
+    config = Config(str(ALEMBIC_INI))
+    config.attributes['configure_logger'] = False
+    command.upgrade(config, "head")
+
+
+async def create_schema():
+    """migrate the tables to head, then lay the timescale setup over them"""
+
+    async with engine.connect() as conn:
+        existing = await conn.run_sync(lambda sync_conn: set(inspect(sync_conn).get_table_names()))
+
+    # tables from the old create_all path but no migration history, upgrading would try to
+    # create them again. see the baseline revision for which revision to stamp
+    if "alembic_version" not in existing and set(Base.metadata.tables) & existing:
+        raise RuntimeError("database has tables but no alembic_version, run `alembic stamp` first")
+
+    # the migrations own every table, column and index in the models
+    await asyncio.to_thread(_upgrade_head)
+    logger.info("migrated schema to head")
 
     async with engine.begin() as conn:
-        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS timescaledb CASCADE;"))
-        logger.info("TimescaleDV extension enabled")
-
-        #drop all tables 
-        # await conn.run_sync(Base.metadata.drop_all)
-        # logger.info("dropped existing tables")
-
-        # create all tables
-        await conn.run_sync(Base.metadata.create_all)
-        logger.info("created tables successfully")
-
-        try:
-            await conn.execute(text("""
-                SELECT create_hypertable(
-                    'ohlcv_daily',
-                    'time',
-                    if_not_exists => True,
-                    chunk_time_interval => INTERVAL '1 month'
-                    );
-            """))
-
-            logger.info("converted ohlcv_daily to timescaledb hypertable")
-        except Exception as e:
-            logger.warning(f"Hypertbale might already exist: {e}")
-
-        await conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_ohlcv_stock_time_desc
-            ON ohlcv_daily (stock_id, time DESC);
-        """))
+        # asyncpg only accepts multiple statements on the simple query protocol,
+        # i.e. a parameterless execute on the driver connection
+        raw_conn = (await conn.get_raw_connection()).driver_connection
+        await raw_conn.execute(TIMESCALE_SQL)
         logger.info("Database initalization complete")
 
 
@@ -47,11 +90,12 @@ async def reset_db():
     """drop and recreate all tables"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
         logger.info("Dropped all tables")
 
-    await init_db()
+    await create_schema()
 
 
 if __name__ == "__main__":
     import asyncio
-    asyncio.run(init_db())
\ No newline at end of file
+    asyncio.run(create_schema())
\ No newline at end of file
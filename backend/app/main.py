@@ -3,14 +3,24 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.config import settings
 from app.db.init_db import init_db
+from app.db.base import async_session_maker
+from app.cache import init_cache, close_cache
+from app.services.indicators.calculator import start_cpu_pool, shutdown_cpu_pool
+from app.services.stock_service import StockDataService
 from app.api.v1 import stocks, database, indicators
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting trading platform API")
     await init_db()
+    async with async_session_maker() as session:
+        await StockDataService(session).load_known_tickers()
+    await init_cache()
+    start_cpu_pool()
     yield 
 
+    await close_cache()
+    shutdown_cpu_pool()
     print("Shutting Down")
 
 
@@ -33,11 +43,6 @@ app.include_router(stocks.router, prefix="/api/v1")
 app.include_router(database.router, prefix="/api/v1")
 app.include_router(indicators.router, prefix="/api/v1")
 
-@app.on_event("startup")
-async def startup_event():
-    await init_db()
-    print('Trading platform API started')
-
 @app.get("/")
 async def root():
     return {
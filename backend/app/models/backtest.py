@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Numeric, Date, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, Numeric, Date, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 import uuid 
 from app.db.base import Base, TimestampMixin
@@ -24,6 +24,10 @@ class BacktestRun(Base, TimestampMixin):
 
 class BacktestResult(Base):
     __tablename__ = "backtest_results"
+    # postgres doesn't index fk columns on its own, joins back to the run need this
+    __table_args__ = (
+        Index('ix_backtest_results_run_id', 'run_id'),
+    )
 
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     run_id = Column(String(36), ForeignKey("backtest_runs.id", ondelete="CASCADE"), nullable=False)  
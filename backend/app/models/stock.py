@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, BigInteger, Numeric, ForeignKey, DateTime, Index, text
+from sqlalchemy import Column, Integer, String, Boolean, BigInteger, Float, ForeignKey, Date, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base, TimestampMixin
 
@@ -16,6 +16,12 @@ class Stock(Base, TimestampMixin):
 
     is_active = Column(Boolean, default=True)
 
+    # date range we've already asked yfinance for, and when. lets a request whose range is
+    # covered skip the fetch even when there's simply no data that far back (e.g. period=max)
+    data_start = Column(Date)
+    data_end = Column(Date)
+    refreshed_at = Column(DateTime)
+
 
     ohlcv_daily = relationship("OHLCVDaily", back_populates="stock", cascade="all, delete-orphan")
 
@@ -29,18 +35,19 @@ class OHLCVDaily(Base):
     time = Column(DateTime, primary_key=True)
     stock_id = Column(Integer, ForeignKey("stocks.id", ondelete="CASCADE"), primary_key=True)
 
-    open = Column(Numeric(12, 4), nullable=False)
-    high = Column(Numeric(12, 4), nullable=False)
-    low = Column(Numeric(12, 4), nullable=False)
-    close = Column(Numeric(12, 4), nullable=False)
-    adj_close = Column(Numeric(12, 4))
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    adj_close = Column(Float)
     volume = Column(BigInteger, nullable=False)
 
 
     stock = relationship("Stock", back_populates="ohlcv_daily")
 
     __table_args__ = (
-        Index('idx_ohlcv_stock_time', 'stock_id', 'time'),
+        # covering, so a range read of the prices is an index only scan on uncompressed chunks
+        Index('idx_ohlcv_stock_time', 'stock_id', 'time', postgresql_include=['open', 'high', 'low', 'close', 'volume']),
     )
 
     def __repr__(self):
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
@@ -50,3 +50,13 @@ class BatchCalculateResponse(BaseModel):
     ticker: str
     results: List[CalculateResponse]
 
+
+class MultiCalculateRequest(BaseModel):
+    tickers: List[str] = Field(..., min_length=1, max_length=50)
+    indicator_name: str
+    params: Dict[str, Any] = {}
+    period: str = "1y"
+
+class MultiCalculateResponse(BaseModel):
+    indicator: str
+    results: Dict[str, CalculateResponse]
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional
+import numpy as np
 
 
 class OHLCVPoint(BaseModel):
@@ -18,6 +20,30 @@ class OHLCVResponse(BaseModel):
     metadata: dict = {}
 
 
+class OHLCVColumnsResponse(BaseModel):
+    """columnar (format=columns) variant of OHLCVResponse, one list per field"""
+    ticker: str
+    period: str
+    time: List[datetime]
+    open: List[float]
+    high: List[float]
+    low: List[float]
+    close: List[float]
+    volume: List[int]
+    metadata: dict = {}
+
+
+@dataclass
+class OHLCVArrays:
+    """columnar ohlcv for internal (non-http) consumers like the indicator calculator"""
+    time: np.ndarray        # datetime64[us]
+    open: np.ndarray        # float64
+    high: np.ndarray        # float64
+    low: np.ndarray         # float64
+    close: np.ndarray       # float64
+    volume: np.ndarray      # int64
+
+
 class StockInfo(BaseModel):
     ticker: str
     name: str
@@ -1,47 +1,111 @@
+import asyncio
 import re
+from collections import defaultdict
 from datetime import date, datetime, time, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Mapping
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from uuid import UUID
 
+import orjson
+from cachetools import TTLCache
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.base import async_session_maker
 from app.schemas.database import (
     DatabaseOverview,
     ForeignKeyReference,
     TableColumn,
     TableOverview,
-    TableRowsResponse,
 )
 
 
+# schema shape changes rarely, keep catalog lookups around briefly instead of
+# re-running the information_schema joins on every request
+CATALOG_CACHE_TTL_SECONDS = 60
+_catalog_cache: TTLCache = TTLCache(maxsize=512, ttl=CATALOG_CACHE_TTL_SECONDS)
+_catalog_locks: Dict[tuple, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+async def _cached(key: tuple, factory: Callable[[], Awaitable[Any]]) -> Any:
+    """return the cached value for key, only one caller runs factory on a miss"""
+
+    if key in _catalog_cache:
+        return _catalog_cache[key]
+
+    async with _catalog_locks[key]:
+        # someone else may have filled it while we waited on the lock
+        if key in _catalog_cache:
+            return _catalog_cache[key]
+
+        value = await factory()
+        _catalog_cache[key] = value
+        return value
+
+
+def invalidate_catalog_cache():
+    """drop cached catalog lookups, call after ddl so the explorer sees it right away"""
+    _catalog_cache.clear()
+
+
+def _orjson_default(value: Any) -> Any:
+    """the few column types orjson can't write natively, same output as _serialize_value"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).hex()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
 class DatabaseExplorerService:
     PUBLIC_SCHEMA = "public"
-    VALID_IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+    VALID_IDENTIFIER_PATTERN = re.compile(r"\A[A-Za-z_][A-Za-z0-9_]*\Z")
+    # per table count + sample queries in flight at once, each holds a pooled connection
+    OVERVIEW_CONCURRENCY = 8
+    # planner estimates are rough on small or never analyzed tables, count those exactly
+    EXACT_COUNT_THRESHOLD = 10_000
+    # pages at least this big are streamed off a server side cursor instead of fetched whole
+    STREAM_ROW_THRESHOLD = 200
+    STREAM_CHUNK_SIZE = 100
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        # names straight from the catalog, already known to be safe to quote
+        self._known_tables: frozenset = frozenset()
 
     async def get_overview(self, sample_limit: int = 5) -> DatabaseOverview:
-        table_names = await self._list_table_names()
+        table_names = await self._load_known_tables()
+        columns_by_table = await _cached(("columns", self.PUBLIC_SCHEMA), self._get_all_columns)
+        foreign_keys_by_table = await _cached(("foreign_keys", self.PUBLIC_SCHEMA), self._get_all_foreign_keys)
+        estimated_counts = await self._estimated_row_counts()
+
+        # an AsyncSession can't run queries concurrently, so each table gets its own
+        semaphore = asyncio.Semaphore(self.OVERVIEW_CONCURRENCY)
+
+        async def count_and_sample(table_name: str):
+            async with semaphore, async_session_maker() as session:
+                row_count = estimated_counts.get(table_name, -1)
+                if row_count < self.EXACT_COUNT_THRESHOLD:
+                    row_count = await self._count_rows(table_name, session)
+                sample_rows = await self._fetch_rows(table_name, limit=sample_limit, offset=0, session=session)
+                return row_count, sample_rows
+
+        table_data = await asyncio.gather(*[count_and_sample(t) for t in table_names])
+
         tables: List[TableOverview] = []
         total_rows = 0
 
-        for table_name in table_names:
-            row_count = await self._count_rows(table_name)
+        for table_name, (row_count, sample_rows) in zip(table_names, table_data):
             total_rows += row_count
 
-            columns = await self._get_columns(table_name)
-            foreign_keys = await self._get_foreign_keys(table_name)
-            sample_rows = await self._fetch_rows(table_name, limit=sample_limit, offset=0)
-
             tables.append(
                 TableOverview(
                     table_name=table_name,
                     row_count=row_count,
-                    columns=columns,
-                    foreign_keys=foreign_keys,
+                    columns=columns_by_table.get(table_name, []),
+                    foreign_keys=foreign_keys_by_table.get(table_name, []),
                     sample_rows=sample_rows,
                 )
             )
@@ -54,23 +118,68 @@ class DatabaseExplorerService:
             tables=tables,
         )
 
-    async def get_table_rows(self, table_name: str, limit: int, offset: int) -> TableRowsResponse:
+    async def get_table_rows_json(self, table_name: str, limit: int, offset: int) -> Union[bytes, AsyncIterator[bytes]]:
+        """
+        the TableRowsResponse payload, with rows going straight from the driver to orjson
+        instead of being converted cell by cell and then validated by pydantic
+        large pages come back as an async iterator of json chunks for a StreamingResponse
+        """
+
         normalized_table_name = self._validate_identifier(table_name)
 
         if not await self._table_exists(normalized_table_name):
             raise KeyError(f"Unknown table: {normalized_table_name}")
 
         total_rows = await self._count_rows(normalized_table_name)
-        rows = await self._fetch_rows(normalized_table_name, limit=limit, offset=offset)
 
-        return TableRowsResponse(
-            table_name=normalized_table_name,
-            total_rows=total_rows,
-            limit=limit,
-            offset=offset,
-            rows=rows,
+        if limit >= self.STREAM_ROW_THRESHOLD:
+            return self._stream_rows_json(normalized_table_name, total_rows, limit, offset)
+
+        keys, rows = await self._fetch_raw_rows(normalized_table_name, limit=limit, offset=offset)
+        column_names = [str(key) for key in keys]
+
+        return orjson.dumps(
+            {
+                "table_name": normalized_table_name,
+                "total_rows": total_rows,
+                "limit": limit,
+                "offset": offset,
+                "rows": [dict(zip(column_names, row)) for row in rows],
+            },
+            default=_orjson_default,
         )
 
+    async def _stream_rows_json(self, table_name: str, total_rows: int, limit: int, offset: int) -> AsyncIterator[bytes]:
+        """
+        yield the rows payload in pieces, only STREAM_CHUNK_SIZE rows are decoded at a time
+        uses its own session so it can outlive the request's
+        """
+
+        yield orjson.dumps({
+            "table_name": table_name,
+            "total_rows": total_rows,
+            "limit": limit,
+            "offset": offset,
+        })[:-1] + b',"rows":['
+
+        table_identifier = self._quote_identifier(table_name)
+        query = text(f"SELECT * FROM {table_identifier} LIMIT :limit OFFSET :offset;")
+
+        first = True
+        async with async_session_maker() as session:
+            result = await session.stream(query, {"limit": limit, "offset": offset})
+            column_names = [str(key) for key in result.keys()]
+
+            async for rows in result.partitions(self.STREAM_CHUNK_SIZE):
+                chunk = orjson.dumps(
+                    [dict(zip(column_names, row)) for row in rows], default=_orjson_default
+                )[1:-1]
+
+                yield chunk if first else b"," + chunk
+                first = False
+
+        yield b"]}"
+
     async def _list_table_names(self) -> List[str]:
         query = text(
             """
@@ -84,7 +193,17 @@ class DatabaseExplorerService:
         result = await self.session.execute(query, {"schema": self.PUBLIC_SCHEMA})
         return [str(row.table_name) for row in result]
 
+    async def _load_known_tables(self) -> List[str]:
+        table_names = await _cached(("tables", self.PUBLIC_SCHEMA), self._list_table_names)
+        self._known_tables = frozenset(table_names)
+        return table_names
+
     async def _table_exists(self, table_name: str) -> bool:
+        await self._load_known_tables()
+        if table_name in self._known_tables:
+            return True
+
+        # not a cached base table, could be a view or created since the cache filled
         query = text(
             """
             SELECT EXISTS (
@@ -101,140 +220,210 @@ class DatabaseExplorerService:
         row = result.one()
         return bool(row.table_exists)
 
-    async def _get_columns(self, table_name: str) -> List[TableColumn]:
-        primary_keys_query = text(
-            """
-            SELECT kcu.column_name
-            FROM information_schema.table_constraints AS tc
-            JOIN information_schema.key_column_usage AS kcu
-              ON tc.constraint_name = kcu.constraint_name
-             AND tc.table_schema = kcu.table_schema
-            WHERE tc.table_schema = :schema
-              AND tc.table_name = :table_name
-              AND tc.constraint_type = 'PRIMARY KEY'
-            ORDER BY kcu.ordinal_position;
-            """
-        )
-        primary_key_result = await self.session.execute(
-            primary_keys_query,
-            {"schema": self.PUBLIC_SCHEMA, "table_name": table_name},
-        )
-        primary_key_columns = {str(row.column_name) for row in primary_key_result}
+    async def _get_all_columns(self) -> Dict[str, List[TableColumn]]:
+        """every column in the schema, bucketed by table, primary keys flagged in the same query"""
 
         columns_query = text(
             """
+            WITH pk AS (
+                SELECT kcu.table_name, kcu.column_name
+                FROM information_schema.table_constraints AS tc
+                JOIN information_schema.key_column_usage AS kcu
+                  ON tc.constraint_name = kcu.constraint_name
+                 AND tc.table_schema = kcu.table_schema
+                 AND tc.table_name = kcu.table_name
+                WHERE tc.table_schema = :schema
+                  AND tc.constraint_type = 'PRIMARY KEY'
+            )
             SELECT
-                column_name,
-                data_type,
-                is_nullable,
-                column_default
-            FROM information_schema.columns
-            WHERE table_schema = :schema
-              AND table_name = :table_name
-            ORDER BY ordinal_position;
+                c.table_name,
+                c.column_name,
+                c.data_type,
+                c.is_nullable,
+                c.column_default,
+                pk.column_name IS NOT NULL AS is_primary_key
+            FROM information_schema.columns AS c
+            LEFT JOIN pk
+              ON pk.table_name = c.table_name
+             AND pk.column_name = c.column_name
+            WHERE c.table_schema = :schema
+            ORDER BY c.table_name, c.ordinal_position;
             """
         )
         columns_result = await self.session.execute(
-            columns_query,
-            {"schema": self.PUBLIC_SCHEMA, "table_name": table_name},
+            columns_query, {"schema": self.PUBLIC_SCHEMA}
         )
 
-        columns: List[TableColumn] = []
+        columns: Dict[str, List[TableColumn]] = defaultdict(list)
         for row in columns_result:
+            table_name = str(row.table_name)
             column_name = str(row.column_name)
-            columns.append(
+            columns[table_name].append(
                 TableColumn(
                     name=column_name,
                     data_type=str(row.data_type),
                     is_nullable=str(row.is_nullable).upper() == "YES",
-                    is_primary_key=column_name in primary_key_columns,
+                    is_primary_key=bool(row.is_primary_key),
                     default=str(row.column_default) if row.column_default is not None else None,
                 )
             )
 
-        return columns
+        return dict(columns)
 
-    async def _get_foreign_keys(self, table_name: str) -> List[ForeignKeyReference]:
+    async def _get_all_foreign_keys(self) -> Dict[str, List[ForeignKeyReference]]:
+        """every foreign key in the schema, bucketed by the referencing table"""
+
+        # straight off pg_constraint, much cheaper than joining four information_schema views
         foreign_keys_query = text(
             """
             SELECT
-                kcu.column_name AS column_name,
-                ccu.table_name AS referenced_table,
-                ccu.column_name AS referenced_column,
-                rc.delete_rule AS on_delete
-            FROM information_schema.table_constraints AS tc
-            JOIN information_schema.key_column_usage AS kcu
-              ON tc.constraint_name = kcu.constraint_name
-             AND tc.table_schema = kcu.table_schema
-            JOIN information_schema.constraint_column_usage AS ccu
-              ON ccu.constraint_name = tc.constraint_name
-             AND ccu.constraint_schema = tc.table_schema
-            JOIN information_schema.referential_constraints AS rc
-              ON rc.constraint_name = tc.constraint_name
-             AND rc.constraint_schema = tc.table_schema
-            WHERE tc.table_schema = :schema
-              AND tc.table_name = :table_name
-              AND tc.constraint_type = 'FOREIGN KEY'
-            ORDER BY kcu.ordinal_position;
+                cl.relname AS table_name,
+                a.attname AS column_name,
+                ref.relname AS referenced_table,
+                ra.attname AS referenced_column,
+                CASE con.confdeltype
+                    WHEN 'a' THEN 'NO ACTION'
+                    WHEN 'r' THEN 'RESTRICT'
+                    WHEN 'c' THEN 'CASCADE'
+                    WHEN 'n' THEN 'SET NULL'
+                    WHEN 'd' THEN 'SET DEFAULT'
+                END AS on_delete
+            FROM pg_constraint AS con
+            JOIN pg_class AS cl
+              ON cl.oid = con.conrelid
+            JOIN pg_namespace AS n
+              ON n.oid = cl.relnamespace
+            JOIN pg_class AS ref
+              ON ref.oid = con.confrelid
+            CROSS JOIN LATERAL unnest(con.conkey, con.confkey)
+                WITH ORDINALITY AS k(attnum, ref_attnum, position)
+            JOIN pg_attribute AS a
+              ON a.attrelid = con.conrelid
+             AND a.attnum = k.attnum
+            JOIN pg_attribute AS ra
+              ON ra.attrelid = con.confrelid
+             AND ra.attnum = k.ref_attnum
+            WHERE con.contype = 'f'
+              AND n.nspname = :schema
+            ORDER BY cl.relname, con.conname, k.position;
             """
         )
         result = await self.session.execute(
-            foreign_keys_query,
-            {"schema": self.PUBLIC_SCHEMA, "table_name": table_name},
+            foreign_keys_query, {"schema": self.PUBLIC_SCHEMA}
         )
 
-        return [
-            ForeignKeyReference(
-                column_name=str(row.column_name),
-                referenced_table=str(row.referenced_table),
-                referenced_column=str(row.referenced_column),
-                on_delete=str(row.on_delete) if row.on_delete is not None else None,
+        foreign_keys: Dict[str, List[ForeignKeyReference]] = defaultdict(list)
+        for row in result:
+            foreign_keys[str(row.table_name)].append(
+                ForeignKeyReference(
+                    column_name=str(row.column_name),
+                    referenced_table=str(row.referenced_table),
+                    referenced_column=str(row.referenced_column),
+                    on_delete=str(row.on_delete) if row.on_delete is not None else None,
+                )
             )
-            for row in result
-        ]
 
-    async def _count_rows(self, table_name: str) -> int:
+        return dict(foreign_keys)
+
+    async def _estimated_row_counts(self) -> Dict[str, int]:
+        """
+        planner row estimates for every table, free compared to COUNT(*)
+        a hypertable's parent holds no rows itself, timescale sums its chunks instead
+        """
+
+        query = text(
+            """
+            SELECT
+                c.relname AS table_name,
+                CASE
+                    WHEN h.hypertable_name IS NOT NULL THEN approximate_row_count(c.oid)
+                    ELSE c.reltuples::bigint
+                END AS estimate
+            FROM pg_class AS c
+            JOIN pg_namespace AS n
+              ON n.oid = c.relnamespace
+            LEFT JOIN timescaledb_information.hypertables AS h
+              ON h.hypertable_schema = n.nspname
+             AND h.hypertable_name = c.relname
+            WHERE n.nspname = :schema
+              AND c.relkind IN ('r', 'p');
+            """
+        )
+        result = await self.session.execute(query, {"schema": self.PUBLIC_SCHEMA})
+        return {str(row.table_name): int(row.estimate) for row in result}
+
+    async def _count_rows(self, table_name: str, session: Optional[AsyncSession] = None) -> int:
         table_identifier = self._quote_identifier(table_name)
         query = text(f"SELECT COUNT(*) AS row_count FROM {table_identifier};")
-        result = await self.session.execute(query)
+        result = await (session or self.session).execute(query)
         row = result.one()
         return int(row.row_count)
 
-    async def _fetch_rows(self, table_name: str, limit: int, offset: int) -> List[Dict[str, Any]]:
+    async def _fetch_rows(
+        self, table_name: str, limit: int, offset: int, session: Optional[AsyncSession] = None
+    ) -> List[Dict[str, Any]]:
         if limit <= 0:
             return []
 
+        keys, rows = await self._fetch_raw_rows(table_name, limit, offset, session)
+        return self._serialize_rows(keys, rows)
+
+    async def _fetch_raw_rows(
+        self, table_name: str, limit: int, offset: int, session: Optional[AsyncSession] = None
+    ) -> Tuple[List[Any], List[Any]]:
         table_identifier = self._quote_identifier(table_name)
         query = text(f"SELECT * FROM {table_identifier} LIMIT :limit OFFSET :offset;")
-        result = await self.session.execute(query, {"limit": limit, "offset": offset})
-        mapped_rows = result.mappings().all()
-        return [self._serialize_mapping(row) for row in mapped_rows]
+        result = await (session or self.session).execute(query, {"limit": limit, "offset": offset})
+        return list(result.keys()), result.all()
 
     def _quote_identifier(self, identifier: str) -> str:
+        if identifier in self._known_tables:
+            return f'"{identifier}"'
         normalized_identifier = self._validate_identifier(identifier)
         return f'"{normalized_identifier}"'
 
     def _validate_identifier(self, identifier: str) -> str:
-        if not self.VALID_IDENTIFIER_PATTERN.match(identifier):
+        if not self.VALID_IDENTIFIER_PATTERN.fullmatch(identifier):
             raise ValueError("Invalid table name")
         return identifier
 
-    def _serialize_mapping(self, row: Mapping[str, Any]) -> Dict[str, Any]:
-        return {str(key): self._serialize_value(value) for key, value in row.items()}
+    def _serialize_rows(self, keys: List[Any], rows: List[Any]) -> List[Dict[str, Any]]:
+        # column names are the same for every row, stringify them once per result
+        column_names = [str(key) for key in keys]
+        serialize = self._serialize_value
+        return [
+            {name: serialize(value) for name, value in zip(column_names, row)}
+            for row in rows
+        ]
+
+    # exact type -> converter, one dict lookup per cell instead of an isinstance ladder
+    _SERIALIZERS: Dict[type, Callable[[Any], Any]] = {
+        datetime: datetime.isoformat,
+        date: date.isoformat,
+        time: time.isoformat,
+        Decimal: float,
+        UUID: str,
+        bytes: bytes.hex,
+    }
+    _PASSTHROUGH_TYPES = frozenset({str, int, float, bool})
 
     def _serialize_value(self, value: Any) -> Any:
-        if value is None:
-            return None
-        if isinstance(value, (datetime, date, time)):
-            return value.isoformat()
-        if isinstance(value, Decimal):
-            return float(value)
-        if isinstance(value, UUID):
-            return str(value)
-        if isinstance(value, bytes):
-            return value.hex()
+        value_type = type(value)
+        if value is None or value_type in self._PASSTHROUGH_TYPES:
+            return value
+
+        serializer = self._SERIALIZERS.get(value_type)
+        if serializer is not None:
+            return serializer(value)
+
         if isinstance(value, dict):
             return {str(key): self._serialize_value(item) for key, item in value.items()}
         if isinstance(value, list):
             return [self._serialize_value(item) for item in value]
+
+        # subclasses (e.g. asyncpg's pgproto UUID) miss the exact lookup
+        for base, serializer in self._SERIALIZERS.items():
+            if isinstance(value, base):
+                return serializer(value)
+
         return value
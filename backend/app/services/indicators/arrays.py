@@ -0,0 +1,60 @@
+from multiprocessing.shared_memory import SharedMemory
+import sys
+import numpy as np
+
+from app.schemas.stock import OHLCVArrays
+
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+# column order inside a shared block, every column is 8 bytes per bar
+SHARED_COLUMNS = ("time", "open", "high", "low", "close", "volume")
+
+
+def publish_shared_ohlcv(arrays: OHLCVArrays) -> SharedMemory:
+    """
+    copy the ohlcv columns into one shared memory block so pool workers can
+    attach by name instead of each receiving a pickled copy
+    caller owns the block and must close() + unlink() it
+    """
+
+    n = len(arrays.time)
+    shm = SharedMemory(create=True, size=len(SHARED_COLUMNS) * n * 8)
+
+    block = np.ndarray((len(SHARED_COLUMNS), n), dtype=np.int64, buffer=shm.buf)
+    block[0] = arrays.time.view(np.int64)
+    for i, name in enumerate(PRICE_COLUMNS, start=1):
+        block[i] = getattr(arrays, name).view(np.int64)
+    block[5] = arrays.volume
+    del block
+
+    return shm
+
+
+def attach_shared_ohlcv(name: str) -> SharedMemory:
+    """
+    open a block published by publish_shared_ohlcv from a pool worker
+    the publisher owns it, so 3.13+ skips resource tracking outright. older versions always
+    register the attach, which is only harmless when the worker shares the publisher's
+    tracker (see calculator.start_cpu_pool)
+    """
+
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+
+    return SharedMemory(name=name)
+
+
+def view_shared_ohlcv(shm: SharedMemory, n: int) -> OHLCVArrays:
+    """zero copy OHLCVArrays over a block written by publish_shared_ohlcv"""
+
+    block = np.ndarray((len(SHARED_COLUMNS), n), dtype=np.int64, buffer=shm.buf)
+
+    return OHLCVArrays(
+        time=block[0].view("datetime64[us]"),
+        open=block[1].view(np.float64),
+        high=block[2].view(np.float64),
+        low=block[3].view(np.float64),
+        close=block[4].view(np.float64),
+        volume=block[5],
+    )
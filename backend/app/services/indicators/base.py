@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Optional, Callable
-import pandas as pd
+from pydantic import Field, TypeAdapter, create_model
 
 class IndicatorCategory(str, Enum):
     TREND = "trend"
@@ -13,6 +13,8 @@ class OutputType(str, Enum):
     OVERLAY = "overlay"         # if drawn on price chart
     SEPARATE = "separate"       # if gets its own pane
 
+PARAM_TYPES = {"int": int, "float": float}
+
 @dataclass
 class IndicatorParam:
     name: str
@@ -30,3 +32,25 @@ class IndicatorDefinition:
     params: List[IndicatorParam]
     output_names: List[str]
     compute_fn: Callable
+    params_adapter: TypeAdapter = field(init=False, repr=False, compare=False)
+    _defaults: dict = field(init=False, repr=False, compare=False)
+    _allowed: frozenset = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._defaults = {p.name: p.default for p in self.params}
+        self._allowed = frozenset(self._defaults)
+
+        # build the params validator once per indicator instead of per request
+        fields = {
+            p.name: (PARAM_TYPES.get(p.param_type, float), Field(p.default, ge=p.min_val, le=p.max_val))
+            for p in self.params
+        }
+        self.params_adapter = TypeAdapter(create_model(f"{self.name}_params", **fields))
+
+    def validate_params(self, params: dict) -> dict:
+        """coerce params to their declared types, fill defaults and enforce the bounds"""
+        return self.params_adapter.validate_python(params).model_dump()
+
+    def resolve_params(self, params: dict) -> dict:
+        """defaults merged with the known keys of params, for params validate_params already checked"""
+        return {**self._defaults, **{k: v for k, v in params.items() if k in self._allowed}}
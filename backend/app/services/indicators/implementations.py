@@ -1,24 +1,24 @@
-import talib
-import pandas as pd
+import numpy as np
 from typing import Dict
+from app.schemas.stock import OHLCVArrays
+from . import kernels
 
-def compute_sma(df: pd.DataFrame, period: int = 20) -> Dict[str, pd.Series]:
-    return {"sma": talib.SMA(df["close"], timeperiod=period)}
+def compute_sma(arrays: OHLCVArrays, period: int = 20) -> Dict[str, np.ndarray]:
+    return {"sma": kernels.sma(arrays.close, period)}
 
-def compute_ema(df: pd.DataFrame, period: int = 20) -> Dict[str, pd.Series]:
-    return {"ema": talib.EMA(df['close'], timeperiod=period)}
+def compute_ema(arrays: OHLCVArrays, period: int = 20) -> Dict[str, np.ndarray]:
+    return {"ema": kernels.ema(arrays.close, period)}
 
-def compute_rsi(df: pd.DataFrame, period: int = 14) -> Dict[str, pd.Series]:
-    return {"rsi": talib.RSI(df["close"], timeperiod=period)}
+def compute_rsi(arrays: OHLCVArrays, period: int = 14) -> Dict[str, np.ndarray]:
+    return {"rsi": kernels.rsi(arrays.close, period)}
 
-def compute_macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.Series]:
-    macd,macd_signal, macd_hist = talib.MACD(
-        df["close"], fastperiod=fast, slowperiod=slow, signalperiod=signal
-    )
+def compute_macd(arrays: OHLCVArrays, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    macd,macd_signal, macd_hist = kernels.macd(arrays.close, fast, slow, signal)
     return {"macd": macd, "signal": macd_signal, "histogram": macd_hist}
 
-def compute_bbands(df: pd.DataFrame, period: int = 20, std_dev: float = 2.0) -> Dict[str, pd.Series]:
-    upper, middle, lower = talib.BBANDS(
-        df["close"], timeperiod=period, nbdevup=std_dev, nbdevdn=std_dev
-    )
+def compute_bbands(arrays: OHLCVArrays, period: int = 20, std_dev: float = 2.0) -> Dict[str, np.ndarray]:
+    upper, middle, lower = kernels.bbands(arrays.close, period, std_dev)
     return {"upper": upper, "middle": middle, "lower":lower}
+
+def compute_atr(arrays: OHLCVArrays, period: int = 14) -> Dict[str, np.ndarray]:
+    return {"atr": kernels.atr(arrays.high, arrays.low, arrays.close, period)}
@@ -0,0 +1,26 @@
+"""
+raw numpy kernels, every indicator bottoms out in one of these compiled ta-lib calls
+inputs must be contiguous float64 arrays
+"""
+from typing import Tuple
+import numpy as np
+import talib
+
+
+def sma(close: np.ndarray, period: int) -> np.ndarray:
+    return talib.SMA(close, timeperiod=period)
+
+def ema(close: np.ndarray, period: int) -> np.ndarray:
+    return talib.EMA(close, timeperiod=period)
+
+def rsi(close: np.ndarray, period: int) -> np.ndarray:
+    return talib.RSI(close, timeperiod=period)
+
+def macd(close: np.ndarray, fast: int, slow: int, signal: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return talib.MACD(close, fastperiod=fast, slowperiod=slow, signalperiod=signal)
+
+def bbands(close: np.ndarray, period: int, std_dev: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return talib.BBANDS(close, timeperiod=period, nbdevup=std_dev, nbdevdn=std_dev)
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    return talib.ATR(high, low, close, timeperiod=period)
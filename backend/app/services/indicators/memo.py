@@ -0,0 +1,25 @@
+from typing import Optional
+
+import orjson
+from cachetools import TTLCache
+
+
+# finished payloads for hot (ticker, period, indicator, params) combinations, keyed with the
+# newest bar time and when the stock's bars were last stored, so a new bar or a re-fetch of
+# existing ones naturally misses instead of needing an invalidation
+_payload_memo: TTLCache = TTLCache(maxsize=4096, ttl=300)
+
+
+def memo_key(ticker: str, period: str, indicator_name: str, params: dict, start_date, latest_bar, refreshed_at) -> tuple:
+    return (
+        ticker.upper(), period, indicator_name, orjson.dumps(params, option=orjson.OPT_SORT_KEYS),
+        start_date, latest_bar, refreshed_at
+    )
+
+
+def memo_get(key: tuple) -> Optional[dict]:
+    return _payload_memo.get(key)
+
+
+def memo_set(key: tuple, payload: dict):
+    _payload_memo[key] = payload
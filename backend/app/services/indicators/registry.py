@@ -1,6 +1,8 @@
+from functools import lru_cache
 from typing import Dict, Optional, List
 from .base import IndicatorDefinition, IndicatorParam, IndicatorCategory, OutputType
 from . import implementations as impl
+from app.schemas.indicator import IndicatorDetail, IndicatorParamSchema
 
 
 class IndicatorRegistry:
@@ -65,6 +67,15 @@ class IndicatorRegistry:
             output_names=["rsi"],
             compute_fn=impl.compute_rsi,
         ))
+        self.register(IndicatorDefinition(
+            name="atr",
+            display_name="Average True Range",
+            category=IndicatorCategory.VOLATILITY,
+            output_type=OutputType.SEPARATE,
+            params=[IndicatorParam("period", "int", default=14, min_val=1, max_val=100)],
+            output_names=["atr"],
+            compute_fn=impl.compute_atr,
+        ))
 
 
     def register(self, indicator: IndicatorDefinition):
@@ -80,4 +91,29 @@ class IndicatorRegistry:
         return [i for i in self._indicators.values() if i.category == category]
     
 
-indicator_registry = IndicatorRegistry()
\ No newline at end of file
+indicator_registry = IndicatorRegistry()
+
+
+@lru_cache(maxsize=256)
+def indicator_detail(name: str) -> Optional[IndicatorDetail]:
+    """schema view of a registered indicator, built once per name"""
+
+    ind = indicator_registry.get(name)
+
+    if not ind:
+        return None
+
+    return IndicatorDetail(
+        name=ind.name,
+        display_name=ind.display_name,
+        category=ind.category,
+        output_type=ind.output_type,
+        params=[IndicatorParamSchema(
+            name=p.name,
+            param_type= p.param_type,
+            default=p.default,
+            min_val=p.min_val,
+            max_val=p.max_val
+        ) for p in ind.params],
+        output_names= ind.output_names
+    )
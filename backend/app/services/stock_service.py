@@ -1,42 +1,172 @@
 import yfinance as yf
 from datetime import datetime, timedelta, date
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm.attributes import set_committed_value
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import asyncio
+import asyncpg
 import logging
+import numpy as np
+import orjson
+from cachetools import TTLCache
+from app.cache import cache_get, cache_set, cache_key
+from app.config import settings
+from app.db.base import engine
 from app.models.stock import Stock, OHLCVDaily
-from app.schemas.stock import OHLCVResponse, OHLCVPoint, StockInfo
+from app.schemas.stock import OHLCVResponse, OHLCVPoint, OHLCVArrays, StockInfo
 
 logger = logging.getLogger(__name__)
 
+# the float8 casts are no-ops once prices are double precision, but keep a database
+# that hasn't run the migration yet off asyncpg's Decimal decoding
+OHLCV_RANGE_SQL = """
+    SELECT time, open::float8, high::float8, low::float8, close::float8, volume
+    FROM ohlcv_daily
+    WHERE stock_id = $1 AND time >= $2 AND time <= $3
+    ORDER BY time
+"""
+
+# every yfinance call is a full http round trip. company info barely changes, the quote
+# moves intraday, so they're fetched and cached separately. static info is also shared
+# through redis so every worker process doesn't fetch it on its own
+INFO_TTL_SECONDS = 24 * 60 * 60
+QUOTE_TTL_SECONDS = 60
+_info_cache: TTLCache = TTLCache(maxsize=2048, ttl=INFO_TTL_SECONDS)
+_quote_cache: TTLCache = TTLCache(maxsize=2048, ttl=QUOTE_TTL_SECONDS)
+_yf_locks = defaultdict(asyncio.Lock)
+
+# tickers known to be in the stocks table, seeded at startup by load_known_tickers. they
+# skip the speculative info fetch in get_or_create_stock
+_known_tickers: set = set()
+
+# yfinance blocks on http, every call gets its own threads so slow lookups don't
+# starve the default executor anything else offloads to
+_YF_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="yfinance")
+
+
+async def _cached_yf_call(cache: TTLCache, key: tuple, fetch, shared: bool = False):
+    """
+    run the blocking yfinance call in fetch at most once per key per ttl
+    shared=True also reads/writes the value through redis for the other workers
+    """
+
+    if key in cache:
+        return cache[key]
+
+    async with _yf_locks[key]:
+        if key in cache:
+            return cache[key]
+
+        redis_key = cache_key("yf", *key)
+        cached = await cache_get(redis_key) if shared else None
+
+        if cached is not None:
+            value = orjson.loads(cached)
+        else:
+            loop = asyncio.get_running_loop()
+            value = await loop.run_in_executor(_YF_EXECUTOR, fetch)
+
+            # a failed lookup comes back empty, retry it next time rather than pin it for a day
+            if not value:
+                return value
+
+            if shared:
+                await cache_set(redis_key, orjson.dumps(value), int(cache.ttl))
+
+        cache[key] = value
+        return value
+
+
+OHLCV_COLUMNS = ('time', 'stock_id', 'open', 'high', 'low', 'close', 'adj_close', 'volume')
+
+# per connection temp table, emptied by every commit so a pooled connection can reuse it
+OHLCV_STAGE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS ohlcv_daily_stage
+    (LIKE ohlcv_daily INCLUDING DEFAULTS)
+    ON COMMIT DELETE ROWS
+"""
+
+OHLCV_MERGE_SQL = """
+    INSERT INTO ohlcv_daily (time, stock_id, open, high, low, close, adj_close, volume)
+    SELECT time, stock_id, open, high, low, close, adj_close, volume
+    FROM ohlcv_daily_stage
+    ON CONFLICT (stock_id, time) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        adj_close = EXCLUDED.adj_close,
+        volume = EXCLUDED.volume
+    -- an unchanged bar is left alone instead of rewritten
+    WHERE (ohlcv_daily.open, ohlcv_daily.high, ohlcv_daily.low, ohlcv_daily.close, ohlcv_daily.adj_close, ohlcv_daily.volume)
+        IS DISTINCT FROM (EXCLUDED.open, EXCLUDED.high, EXCLUDED.low, EXCLUDED.close, EXCLUDED.adj_close, EXCLUDED.volume)
+"""
+
 class StockDataService:
 
-    BATCH_SIZE = 500
+    # fallback upsert batches: 8 bind params per row keeps each statement under asyncpg's 32767 limit
+    BATCH_SIZE = 4000
+    # how long a fetched range counts as fresh before the bars themselves are checked again
+    REFRESH_TTL = timedelta(hours=1)
+    # days before the end of the covered range that a refetch pulls again, for the partial
+    # last bar and yahoo's late corrections
+    REFETCH_OVERLAP = timedelta(days=5)
+    STREAM_CHUNK_SIZE = 1000
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    async def load_known_tickers(self):
+        """seed _known_tickers with every stored ticker so only new symbols start an info fetch"""
+
+        result = await self.session.execute(select(Stock.ticker))
+        _known_tickers.update(result.scalars().all())
+
     async def get_or_create_stock(self, ticker: str) -> Stock:
         """
         get stock data fron db or create if dne
         """
 
+        ticker = ticker.upper()
+
+        # a ticker missing from the seeded set is most likely new, so start the yfinance info
+        # fetch alongside the lookup instead of after a miss. a cached info needs no task
+        info_task = None
+        if ticker not in _known_tickers and ("info", ticker) not in _info_cache:
+            info_task = asyncio.create_task(self._fetch_stock_info(ticker))
+
         # query for existing stock
+        try:
+            result = await self.session.execute(
+                select(Stock).where(Stock.ticker == ticker)
+            )
+        except BaseException:
+            if info_task:
+                info_task.cancel()
+            raise
 
-        result = await self.session.execute(
-            select(Stock).where(Stock.ticker == ticker.upper())
-        )
         stock = result.scalar_one_or_none()
 
         if stock:
+            _known_tickers.add(ticker)
+            if info_task:
+                info_task.cancel()
             return stock
-        
+
+        # end the lookup transaction so its connection goes back to the pool instead of
+        # sitting idle in transaction for the whole yfinance round trip
+        await self.session.rollback()
+
         # fetch stock info from yf
-        stock_info = await self._fetch_stock_info(ticker)
+        stock_info = await (info_task or self._fetch_stock_info(ticker))
         
         stmt = pg_insert(Stock).values(
-            ticker=ticker.upper(),
+            ticker=ticker,
             name=stock_info.get('longName', ticker),
             exchange=stock_info.get('exchange'),
             sector=stock_info.get('industry'),
@@ -49,7 +179,7 @@ class StockDataService:
 
 
         result = await self.session.execute(
-            select(Stock).where(Stock.ticker == ticker.upper())
+            select(Stock).where(Stock.ticker == ticker)
         )
 
         stock = result.scalar_one_or_none()
@@ -57,6 +187,7 @@ class StockDataService:
         if not stock:
             raise Exception(f"Failed to get or create stock: {ticker}")
 
+        _known_tickers.add(ticker)
         return stock
 
     async def _fetch_stock_info(self, ticker: str) -> dict:
@@ -67,54 +198,178 @@ class StockDataService:
                 return yf.Ticker(ticker).info
             except:
                 return {}
-            
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _fetch)
-    
-    async def get_ohlcv(self, ticker:str, period: str = "max", force_refresh:bool = False):
+
+        return await _cached_yf_call(_info_cache, ("info", ticker.upper()), _fetch, shared=True)
+
+    async def get_many_stock_info(self, tickers: List[str]) -> Dict[str, dict]:
         """
-        get ohlcv data for ticker
-        period options: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
+        yfinance info for several tickers at once, keyed by upper case ticker
+        one yf.Tickers session is shared and the .info reads run in parallel threads
         """
 
-        stock = await self.get_or_create_stock(ticker)
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        infos = {t: _info_cache[("info", t)] for t in tickers if ("info", t) in _info_cache}
+        missing = [t for t in tickers if t not in infos]
 
-        if period == 'max':
-            end_date = datetime.now().date()
-            start_date = date(1900, 1, 1)
-        else:
-            end_date = datetime.now().date()
-            start_date = self._get_start_date(period, end_date)
+        if not missing:
+            return infos
 
-        needs_fetch = force_refresh or await self._needs_data_fetch(stock.id, start_date, end_date)
+        # same read through as _cached_yf_call: redis before yfinance
+        cached = await asyncio.gather(*[cache_get(cache_key("yf", "info", t)) for t in missing])
+        for ticker, value in zip(missing, cached):
+            if value is not None:
+                infos[ticker] = _info_cache[("info", ticker)] = orjson.loads(value)
 
-        if needs_fetch:
-            await self._fetch_and_store_ohlcv(stock, period, start_date, end_date)
+        missing = [t for t in missing if t not in infos]
 
-        result = await self.session.execute(
-            select(OHLCVDaily)
-            .where(
-                OHLCVDaily.stock_id == stock.id,
-                OHLCVDaily.time >= start_date,
-                OHLCVDaily.time <= end_date
+        if not missing:
+            return infos
+
+        # hold every missing ticker's lock, in sorted order so two batches can't deadlock, so a
+        # concurrent _cached_yf_call or batch for the same ticker waits for this fetch
+        async with AsyncExitStack() as stack:
+            for ticker in sorted(missing):
+                await stack.enter_async_context(_yf_locks[("info", ticker)])
+
+            # whoever held a lock before us may have filled it in
+            for ticker in missing:
+                if ("info", ticker) in _info_cache:
+                    infos[ticker] = _info_cache[("info", ticker)]
+
+            missing = [t for t in missing if t not in infos]
+
+            if not missing:
+                return infos
+
+            batch = yf.Tickers(" ".join(missing)).tickers
+
+            def _fetch(ticker: str) -> dict:
+                try:
+                    return batch[ticker].info
+                except:
+                    return {}
+
+            loop = asyncio.get_running_loop()
+            fetched = await asyncio.gather(*[loop.run_in_executor(_YF_EXECUTOR, _fetch, t) for t in missing])
+
+            for ticker, info in zip(missing, fetched):
+                infos[ticker] = info
+                if not info:
+                    continue
+
+                _info_cache[("info", ticker)] = info
+                await cache_set(cache_key("yf", "info", ticker), orjson.dumps(info), INFO_TTL_SECONDS)
+
+        return infos
+
+    async def prefetch_missing_stocks(self, tickers: List[str]):
+        """warm the info cache for tickers not in the stocks table yet, so get_or_create_stock won't wait on yfinance one by one"""
+
+        tickers = [t.upper() for t in tickers]
+        result = await self.session.execute(select(Stock.ticker).where(Stock.ticker.in_(tickers)))
+        existing = set(result.scalars().all())
+
+        # don't sit idle in transaction during the network calls
+        await self.session.rollback()
+
+        missing = [t for t in tickers if t not in existing]
+        if missing:
+            await self.get_many_stock_info(missing)
+
+    async def prefetch_ohlcv(self, tickers: List[str], period: str):
+        """
+        download bars for every ticker whose range isn't stored yet in a single yf.download,
+        which batches the yahoo requests, so the per ticker reads that follow find them stored
+        """
+
+        start_date, end_date = self._date_range(period)
+
+        # plain (id, ticker) pairs, the rollbacks below and in get_or_create_stock expire
+        # every loaded Stock and an expired one can't lazy load from the download thread
+        stale = []
+        for ticker in dict.fromkeys(t.upper() for t in tickers):
+            stock = await self.get_or_create_stock(ticker)
+            if await self._needs_data_fetch(stock, start_date, end_date):
+                stale.append((stock.id, stock.ticker))
+
+        # a lone ticker gains nothing from batching, the normal path fetches it
+        if len(stale) < 2:
+            return
+
+        # don't sit idle in transaction during the download
+        await self.session.rollback()
+
+        def _download():
+            return yf.download(
+                [ticker for _, ticker in stale],
+                start=start_date,
+                end=end_date + timedelta(days=1),
+                group_by='ticker',
+                auto_adjust=False,
+                threads=True,
+                progress=False
             )
-            .order_by(OHLCVDaily.time)
-        )
 
-        ohlcv_records = result.scalars().all()
+        loop = asyncio.get_running_loop()
+        df = await loop.run_in_executor(_YF_EXECUTOR, _download)
+
+        downloaded = set(df.columns.get_level_values(0)) if df is not None and not df.empty else set()
+
+        # reload the expired stocks in one query before storing against them
+        result = await self.session.execute(select(Stock).where(Stock.id.in_([stock_id for stock_id, _ in stale])))
+        stocks = {stock.id: stock for stock in result.scalars().all()}
+
+        for stock_id, ticker in stale:
+            if ticker not in downloaded or stock_id not in stocks:
+                continue
+
+            # every ticker shares one index, drop the days this one didn't trade
+            frame = df[ticker].dropna(subset=['Close'])
+
+            # a symbol that failed to download comes back all nan, leave it to the per ticker
+            # fetch rather than marking its range as checked
+            if frame.empty:
+                continue
 
-        #convert to resp format
+            await self._store_ohlcv_frame(stocks[stock_id], frame, start_date, end_date)
+
+    async def _fetch_quote(self, ticker: str) -> Tuple[Optional[float], Optional[float]]:
+        """(current price, previous close), from yfinance's lightweight fast_info"""
+
+        def _fetch():
+            try:
+                fast_info = yf.Ticker(ticker).fast_info
+                quote = fast_info.last_price, fast_info.previous_close
+            except:
+                quote = None, None
+
+            # a miss comes back falsy, so _cached_yf_call retries it next time instead of caching it
+            return None if None in quote else quote
+
+        quote = await _cached_yf_call(_quote_cache, ("quote", ticker.upper()), _fetch)
+
+        return quote or (None, None)
+    
+    async def get_ohlcv(self, ticker:str, period: str = "max", force_refresh:bool = False):
+        """
+        get ohlcv data for ticker
+        period options: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
+        """
+
+        ohlcv_records, start_date, end_date = await self._load_ohlcv_records(ticker, period, force_refresh)
+
+        #convert to resp format, rows come straight from the db so skip per point validation
 
         data_points = [
-            OHLCVPoint(
-                time=record.time,
-                open=float(record.open),
-                high=float(record.high),
-                low=float(record.low),
-                close=float(record.close),
-                volume=int(record.volume)
+            OHLCVPoint.model_construct(
+                time=r[0],
+                open=r[1],
+                high=r[2],
+                low=r[3],
+                close=r[4],
+                volume=r[5]
             )
-            for record in ohlcv_records
+            for r in ohlcv_records
         ]
 
         return OHLCVResponse(
@@ -127,7 +382,165 @@ class StockDataService:
                 'end_date': end_date.isoformat()
             }
         )
+
+    async def get_ohlcv_arrays(self, ticker: str, period: str = "max", force_refresh: bool = False) -> OHLCVArrays:
+        """
+        same data as get_ohlcv but columnar, for internal callers that never serialize it
+        skips building an OHLCVPoint per row
+        """
+
+        ohlcv_records, _, _ = await self._load_ohlcv_records(ticker, period, force_refresh)
+
+        return self._records_to_arrays(ohlcv_records)
+
+    async def get_ohlcv_columns_json(self, ticker: str, period: str = "max", force_refresh: bool = False) -> bytes:
+        """
+        OHLCVColumnsResponse as json bytes, the columns go from numpy straight to orjson
+        so nothing is built per bar
+        """
+
+        ohlcv_records, start_date, end_date = await self._load_ohlcv_records(ticker, period, force_refresh)
+        arrays = self._records_to_arrays(ohlcv_records)
+
+        return orjson.dumps({
+            'ticker': ticker.upper(),
+            'period': period,
+            'time': arrays.time.astype("datetime64[s]"),
+            'open': arrays.open,
+            'high': arrays.high,
+            'low': arrays.low,
+            'close': arrays.close,
+            'volume': arrays.volume,
+            'metadata': {
+                'records': len(ohlcv_records),
+                'start_date': start_date.isoformat(),
+                'end_date': end_date.isoformat()
+            }
+        }, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    async def get_range_arrays(self, stock_id: int, start_date: date, end_date: date) -> OHLCVArrays:
+        """columnar bars for a range prepare_ohlcv already made sure is stored"""
+
+        return self._records_to_arrays(await self._fetch_range(stock_id, start_date, end_date))
+
+    async def latest_bar_time(self, stock_id: int):
+        """time of the newest stored bar, a cheap version stamp for anything derived from the bars"""
+
+        result = await self.session.execute(
+            select(func.max(OHLCVDaily.time)).where(OHLCVDaily.stock_id == stock_id)
+        )
+        return result.scalar()
+
+    def _records_to_arrays(self, ohlcv_records) -> OHLCVArrays:
+
+        n = len(ohlcv_records)
+
+        return OHLCVArrays(
+            time=np.fromiter((r[0] for r in ohlcv_records), dtype="datetime64[us]", count=n),
+            open=np.fromiter((r[1] for r in ohlcv_records), dtype=np.float64, count=n),
+            high=np.fromiter((r[2] for r in ohlcv_records), dtype=np.float64, count=n),
+            low=np.fromiter((r[3] for r in ohlcv_records), dtype=np.float64, count=n),
+            close=np.fromiter((r[4] for r in ohlcv_records), dtype=np.float64, count=n),
+            volume=np.fromiter((r[5] for r in ohlcv_records), dtype=np.int64, count=n),
+        )
+
+    async def _load_ohlcv_records(self, ticker: str, period: str, force_refresh: bool):
+
+        stock = await self.get_or_create_stock(ticker)
+        start_date, end_date = self._date_range(period)
+
+        # warm path: the coverage check is usually answered from the stock's refreshed range
+        # without a query, then the read goes over the same connection
+        if not force_refresh and not await self._needs_data_fetch(stock, start_date, end_date):
+            return await self._fetch_range(stock.id, start_date, end_date), start_date, end_date
+
+        stored = await self._fetch_and_store_ohlcv(stock, period, start_date, end_date, full=force_refresh)
+
+        # the rows just written are the whole stored range, no need to read them straight back
+        if stored is not None:
+            return [(r[0], r[2], r[3], r[4], r[5], r[7]) for r in stored], start_date, end_date
+
+        return await self._fetch_range(stock.id, start_date, end_date), start_date, end_date
+
+    async def _fetch_range(self, stock_id: int, start_date: date, end_date: date):
+
+        # hot path: raw asyncpg records, no orm instances or Decimal conversion
+        conn = await self.session.connection()
+        raw_conn = await conn.get_raw_connection()
+
+        return await raw_conn.driver_connection.fetch(
+            OHLCV_RANGE_SQL,
+            stock_id,
+            datetime.combine(start_date, datetime.min.time()),
+            datetime.combine(end_date, datetime.min.time())
+        )
+
+    async def prepare_ohlcv(self, ticker: str, period: str, force_refresh: bool = False):
+        """
+        make sure the stock exists and its bars for period are stored
+        returns (stock, start_date, end_date) for the range to read
+        """
+
+        stock = await self.get_or_create_stock(ticker)
+        start_date, end_date = self._date_range(period)
+
+        needs_fetch = force_refresh or await self._needs_data_fetch(stock, start_date, end_date)
+
+        if needs_fetch:
+            await self._fetch_and_store_ohlcv(stock, period, start_date, end_date, full=force_refresh)
+
+        return stock, start_date, end_date
+
+    @staticmethod
+    async def stream_ohlcv_json(stock_id: int, ticker: str, period: str, start_date: date, end_date: date) -> AsyncIterator[bytes]:
+        """
+        yield the OHLCVResponse json document in pieces, reading the range through a
+        server side cursor so only STREAM_CHUNK_SIZE rows are in memory at a time
+        uses its own pooled connection so it can outlive the request's session
+        """
+
+        yield orjson.dumps({"ticker": ticker.upper(), "period": period})[:-1] + b',"data":['
+
+        count = 0
+        async with engine.connect() as conn:
+            raw_conn = (await conn.get_raw_connection()).driver_connection
+
+            async with raw_conn.transaction():
+                cursor = await raw_conn.cursor(
+                    OHLCV_RANGE_SQL,
+                    stock_id,
+                    datetime.combine(start_date, datetime.min.time()),
+                    datetime.combine(end_date, datetime.min.time())
+                )
+
+                while True:
+                    rows = await cursor.fetch(StockDataService.STREAM_CHUNK_SIZE)
+                    if not rows:
+                        break
+
+                    chunk = orjson.dumps([
+                        {"time": r[0], "open": r[1], "high": r[2], "low": r[3], "close": r[4], "volume": r[5]}
+                        for r in rows
+                    ])[1:-1]
+
+                    yield (b"," + chunk) if count else chunk
+                    count += len(rows)
+
+        yield b'],"metadata":' + orjson.dumps({
+            'records': count,
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat()
+        }) + b'}'
     
+    def _date_range(self, period: str):
+
+        end_date = datetime.now().date()
+
+        if period == 'max':
+            return date(1900, 1, 1), end_date
+
+        return self._get_start_date(period, end_date), end_date
+
     def _get_start_date(self, period:str, end_date:date) -> date:
         period_map = {
             '1d': timedelta(days=1),
@@ -150,46 +563,153 @@ class StockDataService:
         return end_date - delta
     
 
-    async def _fetch_and_store_ohlcv(self, stock: Stock, period: str, start_date: date, end_date: date):
+    async def _fetch_and_store_ohlcv(self, stock: Stock, period: str, start_date: date, end_date: date, full: bool = False) -> Optional[list]:
+        """
+        fetch start_date..end_date from yfinance and upsert it, only the part past the stock's
+        covered range unless full is set
+        returns the stored rows in OHLCV_COLUMNS order when they're everything stored for the
+        range, None when other bars may be stored too and the range has to be read back
+        """
+
+        fetch_start = start_date if full else self._fetch_start(stock, start_date)
 
         def _fetch():
             ticker=yf.Ticker(stock.ticker)
             df = ticker.history(
-                start=start_date,
+                start=fetch_start,
                 end=end_date + timedelta(days=1),
                 auto_adjust=False
             )
             return df
         
-        loop = asyncio.get_event_loop()
-        df = await loop.run_in_executor(None, _fetch)
+        loop = asyncio.get_running_loop()
+        df = await loop.run_in_executor(_YF_EXECUTOR, _fetch)
+
+        # anything before fetch_start was already covered, so the whole range counts as fetched
+        stored = await self._store_ohlcv_frame(stock, df, start_date, end_date)
+
+        return stored if fetch_start == start_date else None
+
+    def _fetch_start(self, stock: Stock, start_date: date) -> date:
+        """
+        where a refetch has to start. once the covered range reaches back to start_date only
+        its tail needs re-downloading, the rest would rewrite (and decompress) old chunks
+        """
+
+        if stock.data_start is None or stock.data_end is None:
+            return start_date
+
+        if stock.data_start > start_date or stock.data_end < start_date:
+            return start_date
+
+        return max(start_date, stock.data_end - self.REFETCH_OVERLAP)
+
+    async def _store_ohlcv_frame(self, stock: Stock, df, start_date: date, end_date: date) -> Optional[list]:
+        """
+        upsert one ticker's yfinance frame covering start_date..end_date and commit
+        returns the rows when the stock had no bars before, so they're all it has, else None
+        """
+
+        # yahoo leaves gaps as nan rows, they'd be copied in (and served) as nan prices
+        if not df.empty:
+            df = df.dropna(subset=['Open', 'High', 'Low', 'Close'])
 
         if df.empty:
-            return
-        
-        records = []    
+            # nothing in range is still an answer, don't ask again until the ttl runs out
+            await self._mark_refreshed(stock, start_date, end_date)
+            await self.session.commit()
+            return None
+
+        has_bars = await self._has_bars(stock.id)
         
-        for idx, row in df.iterrows():
-            dt = idx.to_pydatetime()
-            if dt.tzinfo is not None:
-                dt = idx.tz_localize(None).to_pydatetime()
-            else:
-                dt = idx.to_pydatetime()
-
-            records.append({
-                'time': dt,
-                'stock_id': stock.id,
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'adj_close': float(row['Adj Close']) if 'Adj Close' in row else float(row['Close']),
-                'volume': int(row['Volume'])
-            })
-
-        if not records:
+        # one vectorized tz strip for the whole index instead of per row
+        index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+        times = index.to_pydatetime()
+
+        # pull each column out once, tolist() hands back python scalars for the driver
+        closes = df['Close'].to_numpy(dtype=np.float64)
+        adj_closes = df['Adj Close'].to_numpy(dtype=np.float64) if 'Adj Close' in df else closes
+
+        records = list(zip(
+            times,
+            [stock.id] * len(df),
+            df['Open'].to_numpy(dtype=np.float64).tolist(),
+            df['High'].to_numpy(dtype=np.float64).tolist(),
+            df['Low'].to_numpy(dtype=np.float64).tolist(),
+            closes.tolist(),
+            adj_closes.tolist(),
+            df['Volume'].fillna(0).to_numpy(dtype=np.int64).tolist(),
+        ))
+
+        if settings.OHLCV_COPY_INGEST:
+            await self._copy_ohlcv(stock.id, records, has_bars)
+        else:
+            await self._insert_ohlcv([dict(zip(OHLCV_COLUMNS, r)) for r in records])
+
+        await self._mark_refreshed(stock, start_date, end_date)
+
+        await self.session.commit()
+
+        # bars stored earlier that this download didn't return (gaps, a narrower window) are
+        # still in the range, only a first load can skip the read back
+        return None if has_bars else records
+
+    async def _has_bars(self, stock_id: int) -> bool:
+        result = await self.session.execute(
+            select(select(OHLCVDaily.time).where(OHLCVDaily.stock_id == stock_id).limit(1).exists())
+        )
+        return bool(result.scalar())
+
+    async def _mark_refreshed(self, stock: Stock, start_date: date, end_date: date):
+        """widen the stock's fetched range to include start_date..end_date, stamped now"""
+
+        result = await self.session.execute(
+            update(Stock)
+            .where(Stock.id == stock.id)
+            .values(
+                data_start=func.least(func.coalesce(Stock.data_start, start_date), start_date),
+                data_end=func.greatest(func.coalesce(Stock.data_end, end_date), end_date),
+                refreshed_at=datetime.utcnow()
+            )
+            .returning(Stock.data_start, Stock.data_end, Stock.refreshed_at)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+
+        if row is None:
             return
-    
+
+        # keep the loaded instance in step with what the database settled on, without
+        # marking it dirty, a flushed attribute set would overwrite the least/greatest
+        for key, value in zip(('data_start', 'data_end', 'refreshed_at'), row):
+            set_committed_value(stock, key, value)
+
+    async def _copy_ohlcv(self, stock_id: int, records: list, has_bars: bool):
+        """
+        binary COPY into a staging table, then a single merge into ohlcv_daily
+        a stock's first load has nothing to merge with, so it's copied straight in
+        """
+
+        logger.info(f"Copying {len(records)} bars into ohlcv_daily")
+
+        conn = await self.session.connection()
+        raw_conn = (await conn.get_raw_connection()).driver_connection
+
+        if not has_bars:
+            try:
+                # savepoint, a concurrent first load of the same stock may have won the race
+                async with raw_conn.transaction():
+                    await raw_conn.copy_records_to_table('ohlcv_daily', records=records, columns=OHLCV_COLUMNS)
+                return
+            except asyncpg.UniqueViolationError:
+                logger.info(f"Bars for stock {stock_id} appeared during the load, merging instead")
+
+        await raw_conn.execute(OHLCV_STAGE_SQL)
+        await raw_conn.copy_records_to_table('ohlcv_daily_stage', records=records, columns=OHLCV_COLUMNS)
+        await raw_conn.execute(OHLCV_MERGE_SQL)
+
+    async def _insert_ohlcv(self, records: list):
+
         total_records = len(records)
         logger.info(f"Inserting {total_records} in batches of {self.BATCH_SIZE}")
 
@@ -205,20 +725,25 @@ class StockDataService:
                     'close': stmt.excluded.close,
                     'adj_close': stmt.excluded.adj_close,
                     'volume': stmt.excluded.volume
-                }
+                },
+                # an unchanged bar is left alone instead of rewritten
+                where=tuple_(
+                    OHLCVDaily.open, OHLCVDaily.high, OHLCVDaily.low,
+                    OHLCVDaily.close, OHLCVDaily.adj_close, OHLCVDaily.volume
+                ).is_distinct_from(tuple_(
+                    stmt.excluded.open, stmt.excluded.high, stmt.excluded.low,
+                    stmt.excluded.close, stmt.excluded.adj_close, stmt.excluded.volume
+                ))
             )
             await self.session.execute(stmt)
-        await self.session.commit()
 
 
     async def get_stock_info(self, ticker: str) -> StockInfo:
 
         stock = await self.get_or_create_stock(ticker)
 
-        info = await self._fetch_stock_info(ticker)
-
-        current_price = info.get('current_price') or info.get('regularMarketPrice')
-        previous_close = info.get('previousClose')
+        # static fields come from our stocks row, only the quote needs yfinance
+        current_price, previous_close = await self._fetch_quote(ticker)
 
         change = None
         change_percent = None
@@ -240,24 +765,38 @@ class StockDataService:
         )
     
 
-    async def _needs_data_fetch(self, stock_id: int, start_date: date, end_date: date) -> bool:
-        
-        result = await self.session.execute(
-            select(func.min(OHLCVDaily.time), func.max(OHLCVDaily.time))
-            .where(OHLCVDaily.stock_id == stock_id)
+    async def _needs_data_fetch(self, stock: Stock, start_date: date, end_date: date) -> bool:
+
+        # we asked yfinance for this whole range recently, whatever it had is stored
+        if (
+            stock.refreshed_at is not None
+            and stock.refreshed_at > datetime.utcnow() - self.REFRESH_TTL
+            and stock.data_start is not None and stock.data_start <= start_date
+            and stock.data_end is not None and stock.data_end >= end_date
+        ):
+            return False
+
+        stock_id = stock.id
+
+        # only the two boundaries matter, each EXISTS is a single probe on (stock_id, time)
+        # instead of aggregating over the stock's whole history
+        start_bound = datetime.combine(start_date + timedelta(days=1), datetime.min.time())
+        end_bound = datetime.combine(end_date, datetime.min.time())
+
+        covers_start = (
+            select(OHLCVDaily.time)
+            .where(OHLCVDaily.stock_id == stock_id, OHLCVDaily.time < start_bound)
+            .limit(1)
+            .exists()
+        )
+        covers_end = (
+            select(OHLCVDaily.time)
+            .where(OHLCVDaily.stock_id == stock_id, OHLCVDaily.time >= end_bound)
+            .limit(1)
+            .exists()
         )
 
-        row = result.first()
-
-        min_date, max_date = row if row else (None, None)
+        result = await self.session.execute(select(covers_start, covers_end))
+        has_start, has_end = result.one()
 
-        if not min_date or not max_date:
-            return True
-        
-        min_date_val = min_date.date() if hasattr(min_date, 'date') else min_date
-        max_date_val = max_date.date() if hasattr(max_date, 'date') else max_date
-        
-        if start_date < min_date_val or end_date > max_date_val:
-            return True
-        
-        return False
+        return not (has_start and has_end)
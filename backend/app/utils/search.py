@@ -1,7 +1,11 @@
-import json 
+import orjson
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 from dataclasses import dataclass
+import numpy as np
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
 
 @dataclass
 class SearchResult:
@@ -14,36 +18,99 @@ class SearchResult:
     match_type: str = "ticker"
 
 
-def levenshtein_distance(s1: str, s2: str):
-    
-    s1, s2 = s1.lower(), s2.lower() 
-    len1, len2 = len(s1), len(s2)
+@dataclass
+class _LengthBuckets:
+    """
+    search choices sorted by length. edit distance is at least the length difference,
+    so a query only has to be scored against the band of lengths within max_dist of its own
+    """
+    choices: List[str]
+    lengths: np.ndarray
+    order: np.ndarray       # sorted position -> index in the original choices
+
+    @classmethod
+    def build(cls, choices: List[str]) -> "_LengthBuckets":
+        lengths = np.fromiter((len(c) for c in choices), dtype=np.intp, count=len(choices))
+        order = np.argsort(lengths, kind="stable")
+        return cls([choices[i] for i in order.tolist()], lengths[order], order)
 
-    matrix = [[0] * (len2+1) for _ in range(len1+1)]
-    
-    for i in range(len1+1):
-        matrix[i][0] = i
-    for j in range(len2+1):
-        matrix[0][j] = j
+    def distances(self, query: str, max_dist: int) -> np.ndarray:
+        """distance per original choice, max_dist+1 for anything out of range"""
 
-    for i in range(1, len1+1):
-        for j in range(1, len2+1):
-            cost = 0 if s1[i-1] == s2[j-1] else 1
+        dist = np.full(len(self.order), max_dist + 1, dtype=np.int32)
 
-            matrix[i][j] = min(
-                matrix[i-1][j] + 1,
-                matrix[i][j-1] + 1,
-                matrix[i-1][j-1] + cost
-            )
+        lo, hi = np.searchsorted(self.lengths, [len(query) - max_dist, len(query) + max_dist + 1]).tolist()
+        if lo < hi:
+            # the kernel bails out early past max_dist too (it reports max_dist+1)
+            dist[self.order[lo:hi]] = process.cdist(
+                [query], self.choices[lo:hi],
+                scorer=Levenshtein.distance, score_cutoff=max_dist, dtype=np.int32
+            )[0]
 
+        return dist
 
-    return matrix[len1][len2]
+
+def _load_stocks(file_path: Path) -> List[dict]:
+    try:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        print(f"Warning: Stock file not found at {file_path}")
+        return []
+    except orjson.JSONDecodeError as e:
+        print(f"Error parsing stock json: {e}")
+        return []
+
+
+@dataclass
+class _SearchIndex:
+    """the searchable fields laid out as flat arrays once, so a search is a few batch kernel calls"""
+    stocks: List[dict]
+    tickers: np.ndarray
+    tickers_lower: np.ndarray
+    names_lower: np.ndarray
+    word_owners: np.ndarray     # word -> index of the stock it came from
+    ticker_buckets: _LengthBuckets
+    name_buckets: _LengthBuckets
+    word_buckets: _LengthBuckets
+
+    @classmethod
+    def build(cls, stocks: List[dict]) -> "_SearchIndex":
+
+        tickers = np.array([stock['ticker'] for stock in stocks], dtype=str)
+        tickers_lower = np.char.lower(tickers)
+        names_lower = np.array([stock['name'].lower() for stock in stocks], dtype=str)
+
+        # every word of every name, with the index of the stock it came from
+        words, owners = [], []
+        for i, name in enumerate(names_lower.tolist()):
+            for word in name.split():
+                words.append(word)
+                owners.append(i)
+
+        # cdist wants python strings, keep length sorted lists so a search never rebuilds them
+        return cls(
+            stocks=stocks,
+            tickers=tickers,
+            tickers_lower=tickers_lower,
+            names_lower=names_lower,
+            word_owners=np.array(owners, dtype=np.intp),
+            ticker_buckets=_LengthBuckets.build(tickers_lower.tolist()),
+            name_buckets=_LengthBuckets.build(names_lower.tolist()),
+            word_buckets=_LengthBuckets.build(words),
+        )
+
+
+@lru_cache(maxsize=8)
+def _load_index(path: str, mtime: float) -> _SearchIndex:
+    """parsed + indexed stock file, mtime is part of the key so an edited file is picked up"""
+    return _SearchIndex.build(_load_stocks(Path(path)))
 
 
 class StockSearchService:
     """
     Fuzzy search for tickers and company names
-    uses levenshtein dist for res rankings
+    uses levenshtein dist (rapidfuzz's bit-parallel kernel) for res rankings
     """
 
     MAX_DIST = 5
@@ -53,92 +120,71 @@ class StockSearchService:
         if stocks_file is None:
             stocks_file = Path(__file__).parent.parent / "data" / "popular_stocks.json"
 
-        self.stocks = self._load_stocks(stocks_file)
-
-    
-    def _load_stocks(self, file_path: Path) -> List[dict]:
+        # every service over the same unchanged file shares one index
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            mtime = stocks_file.stat().st_mtime
         except FileNotFoundError:
-            print(f"Warning: Stock file not found at {file_path}")
-            return []
-        except json.JSONDecodeError as e:
-            print(f"Error parsing stock json: {e}")
-            return []
-        
-    def _calculate_ticker_distance(self, query: str, ticker: str) -> int:
+            mtime = -1.0
 
-        query_lower = query.lower()
-        ticker_lower = ticker.lower()
+        self._index = _load_index(str(stocks_file), mtime)
+        self.stocks = self._index.stocks
 
-        if query_lower == ticker_lower:
-            return 0
-        
-        if ticker_lower.startswith(query_lower):
-            return 0
-        
-        return levenshtein_distance(query, ticker)
-    
-    def _calculate_name_distance(self, query: str, name: str) -> int:
-        
-        query_lower = query.lower()
-        name_lower = name.lower()
+    def _ticker_distances(self, query_lower: str) -> np.ndarray:
 
-        if name_lower == query_lower:
-            return 0
-        
-        if query_lower in name_lower:
-            return name_lower.index(query_lower)
-        
-        words = name_lower.split()
+        dist = self._index.ticker_buckets.distances(query_lower, self.MAX_DIST)
 
-        for word in words:
-            if word.startswith(query_lower):
-                return 0 
-            
+        # exact and prefix matches count as perfect
+        dist[np.char.startswith(self._index.tickers_lower, query_lower)] = 0
 
-        min_dist = levenshtein_distance(query, name)
+        return dist
 
-        for word in words:
-            word_dist = levenshtein_distance(query, word)
-            min_dist = min(word_dist, min_dist)
+    def _name_distances(self, query_lower: str) -> np.ndarray:
 
+        # closest of the whole name and each of its words
+        dist = self._index.name_buckets.distances(query_lower, self.MAX_DIST)
+        np.minimum.at(dist, self._index.word_owners, self._index.word_buckets.distances(query_lower, self.MAX_DIST))
+
+        # a substring hit ranks by where it starts, that also covers exact and word prefix matches
+        found_at = np.char.find(self._index.names_lower, query_lower)
+        contains = found_at >= 0
+        dist[contains] = found_at[contains]
+
+        return dist
 
-        return min_dist
-    
     def search(self, query:str, limit: int = 10) -> List[SearchResult]:
         
-        if not query or len(query.strip()) < 1:
+        if not query or len(query.strip()) < 1 or not self.stocks:
             return []
         
-        query = query.strip()
-        res = []
+        query_lower = query.strip().lower()
 
-        for stock in self.stocks:
-            ticker = stock['ticker']
-            name = stock['name']
-
-            ticker_dist = self._calculate_ticker_distance(query, ticker)
-            name_dist = self._calculate_name_distance(query, name)
-
-            if ticker_dist <= name_dist:
-                dist = ticker_dist
-                match_type = "ticker"   
-            else:
-                dist = name_dist
-                match_type = "name"
-
-            if dist <= self.MAX_DIST:
-                res.append(SearchResult(
-                    ticker=ticker,
-                    name=name,
-                    exchange=stock.get('exchange'),
-                    sector=stock.get('sector'),
-                    distance=dist,
-                    match_type=match_type
-                ))
-
-        res.sort(key=lambda x: (x.distance, x.ticker))
-
-        return res[:limit]
\ No newline at end of file
+        ticker_dist = self._ticker_distances(query_lower)
+        name_dist = self._name_distances(query_lower)
+
+        by_ticker = ticker_dist <= name_dist
+        dist = np.where(by_ticker, ticker_dist, name_dist)
+
+        matches = np.flatnonzero(dist <= self.MAX_DIST)
+
+        # only the best limit get ranked: partition out the limit-th best distance and keep
+        # everything at or under it, ties included so the ticker tie-break stays exact
+        if 0 < limit < len(matches):
+            match_dist = dist[matches]
+            cutoff = np.partition(match_dist, limit - 1)[limit - 1]
+            matches = matches[match_dist <= cutoff]
+
+        matches = matches[np.lexsort((self._index.tickers[matches], dist[matches]))][:limit]
+
+        res = []
+        for i in matches.tolist():
+            stock = self.stocks[i]
+            res.append(SearchResult(
+                ticker=stock['ticker'],
+                name=stock['name'],
+                exchange=stock.get('exchange'),
+                sector=stock.get('sector'),
+                distance=int(dist[i]),
+                match_type="ticker" if by_ticker[i] else "name"
+            ))
+
+        return res
@@ -0,0 +1,39 @@
+"""key and ttl helpers in app.cache, no redis needed"""
+from datetime import datetime
+
+from app.cache import MARKET_TZ, cache_key, params_key, seconds_until_market_close
+
+
+def test_cache_key_joins_parts():
+    assert cache_key("indicator", "AAPL", "1y", "rsi", 14) == "indicator:AAPL:1y:rsi:14"
+
+
+def test_cache_key_prefix_matches_its_own_keys():
+    # cache_delete_prefix relies on a trailing empty part giving a "kind:TICKER:" prefix
+    prefix = cache_key("ohlcv", "AAPL", "")
+    assert cache_key("ohlcv", "AAPL", "1y", "rows").startswith(prefix)
+    assert not cache_key("ohlcv", "AAPLX", "1y", "rows").startswith(prefix)
+
+
+def test_params_key_ignores_key_order():
+    assert params_key({"fast": 12, "slow": 26, "signal": 9}) == params_key({"signal": 9, "slow": 26, "fast": 12})
+
+
+def test_params_key_tells_values_apart():
+    assert params_key({"timeperiod": 14}) != params_key({"timeperiod": 15})
+    assert params_key({}) == "{}"
+
+
+def test_ttl_runs_to_the_settled_close_the_same_day():
+    now = datetime(2026, 10, 15, 10, 0, tzinfo=MARKET_TZ)
+    assert seconds_until_market_close(now) == 6 * 3600 + 30 * 60
+
+
+def test_ttl_rolls_over_to_the_next_day_after_the_close():
+    now = datetime(2026, 10, 15, 17, 0, tzinfo=MARKET_TZ)
+    assert seconds_until_market_close(now) == 23 * 3600 + 30 * 60
+
+
+def test_ttl_is_never_zero():
+    now = datetime(2026, 10, 15, 16, 29, 59, 999999, tzinfo=MARKET_TZ)
+    assert seconds_until_market_close(now) == 1
@@ -0,0 +1,108 @@
+"""the async calculator paths against the inline ones, and param validation"""
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.schemas.indicator import BatchIndicatorItem
+from app.schemas.stock import OHLCVArrays
+from app.services.indicators import calculator
+from app.services.indicators.calculator import IndicatorCalculator
+
+
+N_BARS = 500
+ITEMS = [
+    BatchIndicatorItem(name="sma", params={}),
+    BatchIndicatorItem(name="rsi", params={"period": 10}),
+    BatchIndicatorItem(name="macd", params={"fast": 8, "slow": 21}),
+    BatchIndicatorItem(name="bbands", params={"std_dev": 1.5}),
+    BatchIndicatorItem(name="atr", params={}),
+]
+
+
+@pytest.fixture(scope="module")
+def arrays():
+    rng = np.random.default_rng(7)
+    close = np.cumsum(rng.normal(0, 1, N_BARS)) + 100
+    return OHLCVArrays(
+        time=(np.datetime64("2020-01-01") + np.arange(N_BARS)).astype("datetime64[us]"),
+        open=close + rng.normal(0, 0.5, N_BARS),
+        high=close + 1,
+        low=close - 1,
+        close=close,
+        volume=rng.integers(1_000, 10_000, N_BARS),
+    )
+
+
+@pytest.fixture
+def inline_calc():
+    return IndicatorCalculator()
+
+
+@pytest.fixture
+def pooled_calc():
+    # every batch counts as large enough to fan out
+    calc = IndicatorCalculator()
+    calc.PARALLEL_MIN_CELLS = 0
+
+    calculator.start_cpu_pool()
+    yield calc
+    calculator.shutdown_cpu_pool()
+
+
+def test_threaded_batch_matches_inline(arrays, inline_calc):
+    assert inline_calc.use_processes(N_BARS, len(ITEMS)) is False
+
+    got = asyncio.run(inline_calc.calculate_many_async(arrays, ITEMS))
+    assert got == inline_calc.calculate_many(arrays, ITEMS)
+
+
+def test_pooled_batch_matches_inline(arrays, pooled_calc, inline_calc):
+    assert pooled_calc.use_processes(N_BARS, len(ITEMS)) is True
+
+    got = asyncio.run(pooled_calc.calculate_many_async(arrays, ITEMS))
+    assert got == inline_calc.calculate_many(arrays, ITEMS)
+
+
+def test_pooled_single_matches_inline(arrays, pooled_calc, inline_calc):
+    got = asyncio.run(pooled_calc.calculate_async(arrays, "macd", {"signal": 5}))
+    assert got == inline_calc.calculate(arrays, "macd", {"signal": 5})
+
+
+def test_use_processes_needs_a_pool(inline_calc):
+    calculator.shutdown_cpu_pool()
+    inline_calc.PARALLEL_MIN_CELLS = 0
+    assert inline_calc.use_processes(N_BARS, 1) is False
+
+
+def test_payload_maps_warm_up_nans_to_none(arrays, inline_calc):
+    payload = inline_calc.calculate(arrays, "sma", {"period": 5})
+
+    points = payload["data"]["sma"]
+    assert len(points) == N_BARS
+    assert [p["value"] for p in points[:4]] == [None] * 4
+    assert points[4]["value"] == pytest.approx(float(arrays.close[:5].mean()))
+    assert points[0]["time"] == "2020-01-01T00:00:00"
+
+
+def test_validate_fills_defaults_and_coerces(inline_calc):
+    _, params = inline_calc.resolve("macd", {"fast": "8"})
+    assert params == {"fast": 8, "slow": 26, "signal": 9}
+
+
+@pytest.mark.parametrize("name,params", [
+    ("rsi", {"period": 1}),
+    ("rsi", {"period": 101}),
+    ("rsi", {"period": "abc"}),
+    ("no_such_indicator", {}),
+])
+def test_validate_rejects_bad_input(inline_calc, name, params):
+    with pytest.raises(ValueError):
+        inline_calc.resolve(name, params)
+
+
+def test_batch_validates_before_computing(arrays, inline_calc):
+    items = [BatchIndicatorItem(name="sma", params={}), BatchIndicatorItem(name="rsi", params={"period": 0})]
+
+    with pytest.raises(ValueError):
+        asyncio.run(inline_calc.calculate_many_async(arrays, items))
@@ -0,0 +1,121 @@
+"""
+the stored range bookkeeping on stocks: _needs_data_fetch, _mark_refreshed and _fetch_start
+the session is faked, only the decisions and the statements built are under test
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+from app.models.stock import Stock
+from app.services.stock_service import StockDataService
+
+
+START = date(2026, 1, 5)
+END = date(2026, 10, 14)
+
+
+class _Result:
+    def __init__(self, row):
+        self.row = row
+
+    def one(self):
+        return self.row
+
+    def one_or_none(self):
+        return self.row
+
+
+class _FakeSession:
+    """hands back the queued rows in order, one per execute"""
+
+    def __init__(self, *rows):
+        self.rows = list(rows)
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return _Result(self.rows.pop(0))
+
+
+def _stock(data_start=None, data_end=None, refreshed_at=None) -> Stock:
+    stock = Stock(id=1, ticker="TEST", name="test co")
+    stock.data_start = data_start
+    stock.data_end = data_end
+    stock.refreshed_at = refreshed_at
+    return stock
+
+
+def _needs_fetch(stock, *rows):
+    session = _FakeSession(*rows)
+    needs = asyncio.run(StockDataService(session)._needs_data_fetch(stock, START, END))
+    return needs, session
+
+
+def test_fresh_covering_range_skips_the_probes():
+    stock = _stock(START - timedelta(days=10), END, datetime.utcnow() - timedelta(minutes=5))
+
+    needs, session = _needs_fetch(stock)
+
+    assert needs is False
+    assert session.statements == []
+
+
+@pytest.mark.parametrize("stock", [
+    _stock(),
+    _stock(START, END, datetime.utcnow() - StockDataService.REFRESH_TTL - timedelta(minutes=1)),
+    _stock(START + timedelta(days=1), END, datetime.utcnow()),
+    _stock(START, END - timedelta(days=1), datetime.utcnow()),
+])
+def test_stale_or_narrow_range_falls_back_to_the_probes(stock):
+    needs, session = _needs_fetch(stock, (True, True))
+
+    assert needs is False
+    assert len(session.statements) == 1
+
+
+@pytest.mark.parametrize("bounds", [(True, False), (False, True), (False, False)])
+def test_a_missing_boundary_needs_a_fetch(bounds):
+    needs, _ = _needs_fetch(_stock(), bounds)
+    assert needs is True
+
+
+def test_mark_refreshed_widens_in_the_database_and_keeps_the_instance_clean():
+    settled = (START - timedelta(days=30), END, datetime(2026, 10, 15, 12, 0))
+    session = _FakeSession(settled)
+    stock = _stock(START - timedelta(days=30), START, datetime(2026, 10, 1))
+    inspect(stock).committed_state.clear()
+
+    asyncio.run(StockDataService(session)._mark_refreshed(stock, START, END))
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "least(coalesce(stocks.data_start" in sql
+    assert "greatest(coalesce(stocks.data_end" in sql
+
+    assert (stock.data_start, stock.data_end, stock.refreshed_at) == settled
+    # a pending attribute change would be flushed over the least/greatest result
+    for key in ("data_start", "data_end", "refreshed_at"):
+        assert not inspect(stock).attrs[key].history.has_changes()
+
+
+def test_mark_refreshed_on_a_deleted_stock_is_a_no_op():
+    stock = _stock(START, END, datetime(2026, 10, 1))
+
+    asyncio.run(StockDataService(_FakeSession(None))._mark_refreshed(stock, START, END))
+
+    assert stock.refreshed_at == datetime(2026, 10, 1)
+
+
+def test_fetch_start_only_refetches_the_tail_of_a_covered_range():
+    service = StockDataService(None)
+    overlap = StockDataService.REFETCH_OVERLAP
+
+    # nothing recorded, a gap before the stored range or after it: fetch everything
+    assert service._fetch_start(_stock(), START) == START
+    assert service._fetch_start(_stock(START + timedelta(days=1), END), START) == START
+    assert service._fetch_start(_stock(START - timedelta(days=30), START - timedelta(days=1)), START) == START
+
+    assert service._fetch_start(_stock(START, END - timedelta(days=2)), START) == END - timedelta(days=2) - overlap
+    assert service._fetch_start(_stock(START, START + timedelta(days=1)), START) == START
@@ -0,0 +1,78 @@
+"""
+prefetch_ohlcv against a real database, skipped when postgres isn't reachable
+yfinance is stubbed out, only the session handling is under test
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import delete, func, select, text
+
+from app.db.base import engine, async_session_maker
+from app.db.init_db import create_schema
+from app.models.stock import Stock, OHLCVDaily
+from app.services import stock_service
+from app.services.stock_service import StockDataService
+
+
+TICKERS = ["ZZPFA", "ZZPFB"]
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+def _fake_download(tickers, start, end, **kwargs):
+    index = pd.date_range(start, end - timedelta(days=1), freq="D")
+    columns = pd.MultiIndex.from_product([tickers, FIELDS])
+    values = np.tile(np.array([10.0, 11.0, 9.0, 10.5, 10.5, 1000.0]), (len(index), len(tickers)))
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+async def _fake_info(self, ticker):
+    return {"longName": f"{ticker} test co"}
+
+
+async def _cleanup():
+    async with async_session_maker() as session:
+        await session.execute(delete(Stock).where(Stock.ticker.in_(TICKERS)))
+        await session.commit()
+
+
+async def _run():
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"database not reachable: {e}")
+
+    try:
+        await create_schema()
+        await _cleanup()
+
+        async with async_session_maker() as session:
+            await StockDataService(session).prefetch_ohlcv(TICKERS, "5d")
+
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(Stock.ticker, Stock.data_end, func.count(OHLCVDaily.time))
+                .join(OHLCVDaily, OHLCVDaily.stock_id == Stock.id)
+                .where(Stock.ticker.in_(TICKERS))
+                .group_by(Stock.ticker, Stock.data_end)
+            )
+            stored = {ticker: (data_end, count) for ticker, data_end, count in result.all()}
+
+        assert set(stored) == set(TICKERS)
+        for data_end, count in stored.values():
+            assert count > 0
+            assert data_end == datetime.now().date()
+    finally:
+        await _cleanup()
+        await engine.dispose()
+
+
+def test_prefetch_two_stale_tickers(monkeypatch):
+    monkeypatch.setattr(stock_service.yf, "download", _fake_download)
+    monkeypatch.setattr(StockDataService, "_fetch_stock_info", _fake_info)
+
+    asyncio.run(_run())
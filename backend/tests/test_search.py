@@ -0,0 +1,56 @@
+"""length bucketed distances and the partitioned top-k in StockSearchService"""
+import numpy as np
+import pytest
+from rapidfuzz.distance import Levenshtein
+
+from app.utils.search import StockSearchService, _LengthBuckets
+
+
+QUERIES = ["a", "aapl", "APL", "msft", "micro", "bank", "tesla motors", "inc", "zzzzzz", "  nv  ", "co"]
+
+
+@pytest.fixture(scope="module")
+def service():
+    return StockSearchService()
+
+
+def test_buckets_match_brute_force():
+    choices = ["a", "ab", "abc", "apple", "apply", "banana", "", "microsoft", "abcdefghij"]
+    buckets = _LengthBuckets.build(choices)
+
+    for query in ["", "a", "app", "apple", "bananas", "micro", "zzzzzzzzzzzz"]:
+        for max_dist in (0, 1, 3, 5):
+            expected = [min(Levenshtein.distance(query, c), max_dist + 1) for c in choices]
+            assert buckets.distances(query, max_dist).tolist() == expected
+
+
+def _full_sort(service, query, limit):
+    """the ranking before the partition: sort every match by (distance, ticker)"""
+    query_lower = query.strip().lower()
+    ticker_dist = service._ticker_distances(query_lower)
+    name_dist = service._name_distances(query_lower)
+    dist = np.minimum(ticker_dist, name_dist)
+
+    matches = [i for i in range(len(dist)) if dist[i] <= service.MAX_DIST]
+    matches.sort(key=lambda i: (dist[i], service.stocks[i]['ticker']))
+
+    return [(service.stocks[i]['ticker'], int(dist[i])) for i in matches[:limit]]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_top_k_matches_full_sort(service, query):
+    for limit in (1, 2, 3, 5, 10, 50, 1000):
+        got = [(r.ticker, r.distance) for r in service.search(query, limit)]
+        assert got == _full_sort(service, query, limit)
+
+
+def test_prefix_ticker_ranks_first(service):
+    results = service.search("aapl")
+    assert results[0].ticker == "AAPL"
+    assert results[0].distance == 0
+    assert results[0].match_type == "ticker"
+
+
+def test_empty_query(service):
+    assert service.search("") == []
+    assert service.search("   ") == []
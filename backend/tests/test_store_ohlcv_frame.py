@@ -0,0 +1,147 @@
+"""
+_store_ohlcv_frame and _fetch_and_store_ohlcv return semantics, with the writes stubbed out
+a list back means the rows are the whole stored range, None means read it back
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models.stock import Stock
+from app.services import stock_service
+from app.services.stock_service import StockDataService
+
+
+START = date(2026, 10, 5)
+END = date(2026, 10, 9)
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+class _Session:
+    async def commit(self):
+        pass
+
+
+class _Recorder(StockDataService):
+    """records what would be written instead of touching the database"""
+
+    def __init__(self, has_bars: bool):
+        super().__init__(_Session())
+        self.has_bars = has_bars
+        self.written = None
+        self.marked = None
+
+    async def _has_bars(self, stock_id):
+        return self.has_bars
+
+    async def _copy_ohlcv(self, stock_id, records, has_bars):
+        self.written = records
+
+    async def _insert_ohlcv(self, rows):
+        self.written = rows
+
+    async def _mark_refreshed(self, stock, start_date, end_date):
+        self.marked = (start_date, end_date)
+
+
+def _frame(start=START, end=END) -> pd.DataFrame:
+    index = pd.date_range(start, end, freq="D", tz="America/New_York")
+    values = np.tile(np.array([10.0, 11.0, 9.0, 10.5, 10.4, 1000.0]), (len(index), 1))
+    return pd.DataFrame(values, index=index, columns=FIELDS)
+
+
+def _stock(**coverage) -> Stock:
+    return Stock(id=7, ticker="TEST", name="test co", **coverage)
+
+
+def _store(service, df):
+    return asyncio.run(service._store_ohlcv_frame(_stock(), df, START, END))
+
+
+def test_first_load_returns_the_rows_it_wrote():
+    service = _Recorder(has_bars=False)
+
+    stored = _store(service, _frame())
+
+    assert stored == service.written
+    assert len(stored) == 5
+    assert stored[0] == (datetime(2026, 10, 5), 7, 10.0, 11.0, 9.0, 10.5, 10.4, 1000)
+    assert service.marked == (START, END)
+
+
+def test_existing_bars_need_a_read_back():
+    service = _Recorder(has_bars=True)
+
+    assert _store(service, _frame()) is None
+    assert len(service.written) == 5
+
+
+def test_nan_price_rows_are_dropped_and_nan_volume_zeroed():
+    df = _frame()
+    df.iloc[1, df.columns.get_loc("Close")] = np.nan
+    df.iloc[2, df.columns.get_loc("Volume")] = np.nan
+    service = _Recorder(has_bars=False)
+
+    stored = _store(service, df)
+
+    assert [r[0].day for r in stored] == [5, 7, 8, 9]
+    assert stored[1][-1] == 0
+    assert not any(np.isnan(v) for r in stored for v in r[2:7])
+
+
+@pytest.mark.parametrize("df", [_frame().iloc[:0], _frame().assign(Open=np.nan)])
+def test_nothing_usable_still_marks_the_range(df):
+    service = _Recorder(has_bars=False)
+
+    assert _store(service, df) is None
+    assert service.written is None
+    assert service.marked == (START, END)
+
+
+def _fetch_and_store(monkeypatch, stock, start=START, full=False):
+    requested = {}
+
+    class _Ticker:
+        def __init__(self, ticker):
+            pass
+
+        def history(self, start, end, auto_adjust):
+            requested["start"] = start
+            return _frame(start, end - timedelta(days=1))
+
+    monkeypatch.setattr(stock_service.yf, "Ticker", _Ticker)
+    service = _Recorder(has_bars=stock.data_start is not None)
+
+    stored = asyncio.run(service._fetch_and_store_ohlcv(stock, "1mo", start, END, full=full))
+
+    return stored, requested["start"], service
+
+
+def test_covered_stock_only_fetches_the_tail(monkeypatch):
+    start = START - timedelta(days=20)
+    stock = _stock(data_start=start - timedelta(days=30), data_end=END - timedelta(days=1))
+
+    stored, fetch_start, service = _fetch_and_store(monkeypatch, stock, start)
+
+    assert fetch_start == END - timedelta(days=1) - StockDataService.REFETCH_OVERLAP
+    assert len(service.written) == 7
+    assert stored is None
+    # the skipped head was already covered, the whole range is marked
+    assert service.marked == (start, END)
+
+
+def test_full_refetch_ignores_the_coverage(monkeypatch):
+    stock = _stock(data_start=START - timedelta(days=30), data_end=END)
+
+    _, fetch_start, _ = _fetch_and_store(monkeypatch, stock, full=True)
+
+    assert fetch_start == START
+
+
+def test_uncovered_first_load_returns_its_rows(monkeypatch):
+    stored, fetch_start, _ = _fetch_and_store(monkeypatch, _stock())
+
+    assert fetch_start == START
+    assert len(stored) == 5